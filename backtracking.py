@@ -1,4 +1,10 @@
-from typing import List, Tuple, NamedTuple
+import time
+from typing import Dict, List, Optional, Tuple, NamedTuple, Union
+
+from heuristics import heuristic_solution
+from item_set import ItemSet
+from search_engine import depth_first_search
+from solver_stats import incumbent_recorder
 
 # Item structure
 class Item(NamedTuple):
@@ -8,103 +14,175 @@ class Item(NamedTuple):
     ratio: float
 
 
-def solve_backtracking_2d(
-    max_weight: int,
-    max_volume: int,
+def ratio_order(
     weights: List[int],
     volumes: List[int],
     values: List[int]
+) -> List[int]:
+    """
+    Original indices in the branching order of solve_backtracking_2d:
+    value / (weight + volume), descending, ties kept in input order.
+
+    Position k of a selection returned by the solver is the item
+    ratio_order(weights, volumes, values)[k] (ItemSet.ratio_order for an
+    ItemSet).
+    """
+    return sorted(
+        range(len(values)),
+        key=lambda i: values[i] / (weights[i] + volumes[i]),
+        reverse=True
+    )
+
+
+def solve_backtracking_2d(
+    max_weight: int,
+    max_volume: int,
+    weights: Union[List[int], ItemSet],
+    volumes: Optional[List[int]] = None,
+    values: Optional[List[int]] = None,
+    density_bound: bool = True,
+    stats: Optional[Dict] = None,
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    initial_selection: Optional[List[int]] = None,
+    warm_start: bool = True
 ) -> Tuple[int, List[int]]:
     """
     Solves the 0/1 Knapsack problem with TWO constraints (weight + volume)
     using backtracking with pruning.
 
+    The items come as parallel weights/volumes/values lists, or as an
+    ItemSet passed in place of weights (its precomputed ratio order is
+    reused instead of sorting again).
+
+    The search runs on search_engine.depth_first_search (iterative, no
+    recursion limit). The upper bound at each node is read from suffix
+    arrays built once after sorting, so the check is O(1) and allocates
+    nothing. With
+    density_bound the remaining value is also capped by the remaining
+    capacity times the best value/weight (and value/volume) ratio left.
+
+    time_limit (seconds) and max_nodes bound the search. When either is
+    hit the best selection found so far is returned (anytime behavior).
+
+    If a stats dict is given, it receives "node_count", "optimal" (True
+    when the search finished, i.e. optimality was proven), "upper_bound"
+    on the optimum and "gap" = (upper_bound - best_value) / upper_bound,
+    plus the solver_stats counters and the "incumbents" timeline of
+    (seconds, value) improvements.
+
+    initial_selection (indices into the input lists) is a known feasible
+    solution used as the starting incumbent. With warm_start,
+    heuristics.heuristic_solution provides one as well and the better of
+    the two is kept, so nodes that cannot beat it are pruned from the
+    root. If the search finds nothing better, the incumbent is returned.
+
     Returns:
         (best_value, best_selection_indices)
     """
 
-    if not (len(weights) == len(volumes) == len(values)):
-        raise ValueError("weights, volumes and values must have same size")
+    start_time = time.perf_counter()
+
+    if isinstance(weights, ItemSet):
+        item_set = weights
+    else:
+        if not (len(weights) == len(volumes) == len(values)):
+            raise ValueError("weights, volumes and values must have same size")
+        item_set = ItemSet(weights, volumes, values)
 
     if max_weight <= 0 or max_volume <= 0:
         raise ValueError("Capacities must be positive")
 
-    # Build item list
-    items = []
+    weights, volumes, values = item_set.weights, item_set.volumes, item_set.values
+
     for w, vol, val in zip(weights, volumes, values):
         if w <= 0 or vol <= 0 or val <= 0:
             raise ValueError("Weights, volumes and values must be positive")
 
-        # Heuristic ratio: value per (weight + volume)
-        items.append(
-            Item(
-                weight=w,
-                volume=vol,
-                value=val,
-                ratio=val / (w + vol)
-            )
+    # Starting incumbent (indices into the input lists)
+    incumbent: List[int] = []
+    if initial_selection is not None:
+        incumbent = sorted(set(initial_selection))
+        if sum(weights[i] for i in incumbent) > max_weight or \
+           sum(volumes[i] for i in incumbent) > max_volume:
+            raise ValueError("initial_selection exceeds the capacities")
+    if warm_start:
+        _, heuristic = heuristic_solution(max_weight, max_volume, item_set.tolist())
+        if sum(values[i] for i in heuristic) > sum(values[i] for i in incumbent):
+            incumbent = heuristic
+    incumbent_value = sum(values[i] for i in incumbent)
+
+    record = incumbent_recorder(stats, start_time)
+    if record is not None and incumbent_value > 0:
+        record(incumbent_value)
+
+    # Sort for better pruning: value / (weight + volume), descending
+    order = item_set.ratio_order
+
+    # Column arrays in branching order for the search engine
+    ordered = item_set.take(order)
+    item_weights = ordered.weights
+    item_volumes = ordered.volumes
+    item_values = ordered.values
+
+    # Suffix arrays: total value and best value/weight, value/volume
+    # ratios of items[i:] (index n is the empty suffix)
+    n = len(order)
+    suffix_value = [0] * (n + 1)
+    suffix_weight_ratio = [0.0] * (n + 1)
+    suffix_volume_ratio = [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix_value[i] = suffix_value[i + 1] + item_values[i]
+        suffix_weight_ratio[i] = max(
+            suffix_weight_ratio[i + 1], item_values[i] / item_weights[i]
+        )
+        suffix_volume_ratio[i] = max(
+            suffix_volume_ratio[i + 1], item_values[i] / item_volumes[i]
         )
 
-    # Sort for better pruning
-    items.sort(key=lambda x: x.ratio, reverse=True)
-
-    state = {
-        "best_value": 0,
-        "best_selection": [],
-        "node_count": 0
-    }
-
-    def backtrack(
+    def upper_bound(
         index: int,
         current_weight: int,
         current_volume: int,
-        current_value: int,
-        current_selection: List[int]
-    ):
-        state["node_count"] += 1
-
-        # Infeasibility pruning
-        if current_weight > max_weight or current_volume > max_volume:
-            return
-
-        # Upper bound pruning (simple but correct)
-        remaining_value = sum(item.value for item in items[index:])
-        if current_value + remaining_value <= state["best_value"]:
-            return
-
-        # Leaf node
-        if index == len(items):
-            if current_value > state["best_value"]:
-                state["best_value"] = current_value
-                state["best_selection"] = list(current_selection)
-            return
-
-        item = items[index]
-
-        # Include item
-        current_selection.append(index)
-        backtrack(
-            index + 1,
-            current_weight + item.weight,
-            current_volume + item.volume,
-            current_value + item.value,
-            current_selection
-        )
-        current_selection.pop()
-
-        # Exclude item
-        backtrack(
-            index + 1,
-            current_weight,
-            current_volume,
-            current_value,
-            current_selection
-        )
+        current_value: int
+    ) -> float:
+        remaining_value = suffix_value[index]
+        if density_bound:
+            remaining_value = min(
+                remaining_value,
+                (max_weight - current_weight) * suffix_weight_ratio[index],
+                (max_volume - current_volume) * suffix_volume_ratio[index]
+            )
+        return current_value + remaining_value
+
+    best_value, best_selection, node_count, bound_value = depth_first_search(
+        max_weight,
+        max_volume,
+        item_weights,
+        item_volumes,
+        item_values,
+        upper_bound,
+        incumbent_value,
+        on_improve=record,
+        time_limit=time_limit,
+        max_nodes=max_nodes,
+        stats=stats
+    )
 
-    backtrack(0, 0, 0, 0, [])
+    # Nothing beat the incumbent: report it in ratio order positions
+    if best_selection is None:
+        position = {index: k for k, index in enumerate(order)}
+        best_selection = sorted(position[i] for i in incumbent)
+
+    if stats is not None:
+        stats["node_count"] = node_count
+        stats["optimal"] = bound_value <= best_value
+        stats["upper_bound"] = bound_value
+        stats["gap"] = (
+            (bound_value - best_value) / bound_value if bound_value > 0 else 0.0
+        )
 
-    state["best_selection"].sort()
-    return state["best_value"], state["best_selection"]
+    return best_value, best_selection
 
 
 # Example usage
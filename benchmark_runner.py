@@ -1,22 +1,203 @@
 import os
 import csv
+import gc
 import time
+import argparse
 import statistics
 import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from dynamic_programming import solve_with_traceback_3d, read_input
-from branch_and_bound import solve_instance as solve_bb
+from dynamic_programming import solve_with_traceback_3d
+from branch_and_bound import solve as solve_bb
+from instance_loader import load_item_set
 from backtracking import solve_backtracking_2d
+from solver_stats import new_stats, peak_memory
+from solution_cache import SolutionCache
+
+
+SOLVERS = ("dp", "bb", "bt")
+
+# Colunas de estatística (--stats): (prefixo, chave de solver_stats,
+# sufixo); a coluna fica <prefixo>_<solver>[_<sufixo>]
+STAT_COLUMNS = (
+    ("nos", "node_count", None),
+    ("podas_inviaveis", "pruned_infeasible", None),
+    ("podas_bound", "pruned_bound", None),
+    ("avaliacoes_bound", "bound_evals", None),
+    ("tempo_bound", "bound_time", "ms"),
+    ("celulas", "dp_cells", None),
+    ("pico_memoria", "peak_memory", "kb"),
+    ("incumbentes", "incumbents", None),
+)
+
+
+# t de Student bicaudal 95% por graus de liberdade (acima de 30 ~ normal)
+T_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447,
+    7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131,
+    20: 2.086, 25: 2.060, 30: 2.042,
+}
+
+
+def time_solve(solve, repeats=1, warmup=0):
+    # Roda solve() warmup vezes sem medir e depois repeats vezes medindo
+    # só a chamada (perf_counter_ns), com coleta antes e GC desligado
+    if repeats < 1:
+        raise ValueError("repeats precisa ser pelo menos 1")
+    if warmup < 0:
+        raise ValueError("warmup não pode ser negativo")
+
+    for _ in range(warmup):
+        solve()
+
+    times = []
+    gc_enabled = gc.isenabled()
+
+    try:
+        for _ in range(repeats):
+            gc.collect()
+            gc.disable()
+
+            t0 = time.perf_counter_ns()
+            value = solve()
+            times.append((time.perf_counter_ns() - t0) / 1e9)
+
+            if gc_enabled:
+                gc.enable()
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return value, times
+
+
+def summarize_times(times):
+    # Mediana, p95 (nearest-rank) e meia-largura do IC 95% da média
+    ordered = sorted(times)
+    n = len(ordered)
+
+    p95 = ordered[max(0, -(-95 * n // 100) - 1)]
+
+    ci95 = 0.0
+    if n > 1:
+        df = n - 1
+        t = T_95[max(k for k in T_95 if k <= df)] if df <= 30 else 1.96
+        ci95 = t * statistics.stdev(ordered) / n ** 0.5
+
+    return statistics.median(ordered), p95, ci95
+
+
+def stat_column(prefix, solver, suffix):
+    # Nome da coluna de uma estatística, ex.: tempo_bound_bb_ms
+    return f"{prefix}_{solver}_{suffix}" if suffix else f"{prefix}_{solver}"
+
+
+def format_stat(key, value):
+    # Valor de uma estatística como texto do CSV
+    if key == "bound_time":
+        return f"{value * 1000:.2f}"
+    if key == "peak_memory":
+        return f"{value / 1024:.1f}"
+    if key == "incumbents":
+        # "ms:valor" de cada melhora, separados por ";"
+        return ";".join(f"{t * 1000:.2f}:{v}" for t, v in value)
+    return str(value)
+
+
+def run_solver(solver, filepath, repeats=1, warmup=0, time_limit=None,
+               max_nodes=None, profile=False):
+    # Carrega a instância e mede um solver nela (usado pelos processos do
+    # modo --jobs, que recebem só o caminho)
+    max_weight, max_volume, items = load_item_set(filepath)
+    return measure_solver(
+        solver, max_weight, max_volume, items, repeats, warmup,
+        time_limit, max_nodes, profile
+    )
+
+
+def measure_solver(solver, max_weight, max_volume, items, repeats=1, warmup=0,
+                   time_limit=None, max_nodes=None, profile=False):
+    # Roda um único solver numa instância já carregada e devolve
+    # (valor, selecionados, tempos em s, otimalidade provada, estatísticas),
+    # com os selecionados em índices de items
+    # A leitura fica fora da medição; time_limit e max_nodes só valem pros
+    # solvers exponenciais (BB e BT)
+    # Com profile, duas execuções extras (fora da medição de tempo) coletam
+    # as estatísticas de solver_stats e, separadamente pra não distorcer o
+    # tempo no bound, o pico de memória (tracemalloc); senão estatísticas
+    # é None
+    if solver == "bb":
+        def solve(stats):
+            value, selected, _, _ = solve_bb(
+                max_weight, max_volume, items,
+                time_limit=time_limit, max_nodes=max_nodes, stats=stats
+            )
+            return value, selected, stats["optimal"]
+
+    elif solver == "dp":
+        def solve(stats):
+            value, selected, _ = solve_with_traceback_3d(
+                max_weight, max_volume, items, stats
+            )
+            return value, selected, True
+
+    elif solver == "bt":
+        def solve(stats):
+            value, positions = solve_backtracking_2d(
+                max_weight, max_volume, items,
+                stats=stats, time_limit=time_limit, max_nodes=max_nodes
+            )
+            # posições na ordem por densidade -> índices de items
+            order = items.ratio_order
+            return value, sorted(order[k] for k in positions), stats["optimal"]
+
+    else:
+        raise ValueError(f"Solver desconhecido: {solver}")
+
+    (value, selected, optimal), times = time_solve(lambda: solve({}), repeats, warmup)
+
+    stats = None
+    if profile:
+        stats = new_stats()
+        solve(stats)
+        _, stats["peak_memory"] = peak_memory(lambda: solve({}))
+
+    return value, selected, times, optimal, stats
+
+
+def pin_worker(counter):
+    # Fixa cada processo do pool num núcleo diferente, pra que dois
+    # solvers nunca disputem a mesma CPU durante a medição
+    if not hasattr(os, "sched_setaffinity"):
+        return
+
+    with counter.get_lock():
+        slot = counter.value
+        counter.value += 1
+
+    cpus = sorted(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, {cpus[slot % len(cpus)]})
 
 
 class BenchmarkRunner:
-    def __init__(self, instances_dir="instancias"):
+    def __init__(self, instances_dir="instancias", repeats=1, warmup=0,
+                 time_limit=None, max_nodes=None, profile=False,
+                 cache_path=None):
         self.instances_dir = instances_dir
+        self.repeats = repeats
+        self.warmup = warmup
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.profile = profile
         self.results = []
+        # Com cache_path, o ótimo de referência da checagem vem do cache
+        # de soluções (solution_cache); só o processo principal o usa
+        self.cache = SolutionCache(cache_path) if cache_path else None
 
-    def run_all_instances(self):
+    def run_all_instances(self, jobs=1):
         if not os.path.exists(self.instances_dir):
             print(f"Erro: Diretório '{self.instances_dir}' não encontrado!")
             return
@@ -33,6 +214,10 @@ class BenchmarkRunner:
         print("=" * 100)
         print()
 
+        if jobs > 1:
+            self._run_parallel(instances_by_category, jobs)
+            return
+
         for category in sorted(instances_by_category.keys()):
             print(f"Categoria: {category}")
             print("-" * 100)
@@ -41,59 +226,147 @@ class BenchmarkRunner:
                 name = os.path.basename(filepath)
 
                 try:
-                    # ===== Leitura =====
-                    max_weight, max_volume, items = read_input(filepath)
+                    # Lê uma vez e passa a mesma instância pros três solvers
+                    instance = load_item_set(filepath)
+
+                    values, selections, times, optimal, stats = {}, {}, {}, {}, {}
+                    for solver in SOLVERS:
+                        values[solver], selections[solver], times[solver], \
+                            optimal[solver], stats[solver] = measure_solver(
+                                solver, *instance, *self._solver_options()
+                            )
+
+                    self._record(
+                        category, filepath, instance, values, selections,
+                        times, optimal, stats
+                    )
 
-                    weights = [w for w, v, val in items]
-                    volumes = [v for w, v, val in items]
-                    values  = [val for w, v, val in items]
+                except Exception as e:
+                    print(f"  ERR {name:30} | Erro: {e}")
 
-                    # ===== Programação Dinâmica =====
-                    dp_value, selected, dp_time = solve_with_traceback_3d(
-                        max_weight, max_volume, items
-                    )
+    def _run_parallel(self, instances_by_category, jobs):
+        # Distribui os pares (instância, solver) num pool de processos,
+        # cada um fixo num núcleo, e junta os resultados por instância
+        counter = multiprocessing.Value("i", 0)
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=pin_worker,
+            initargs=(counter,)
+        ) as pool:
+            futures = {}
+            for category in instances_by_category:
+                for filepath in instances_by_category[category]:
+                    for solver in SOLVERS:
+                        futures[(filepath, solver)] = pool.submit(
+                            run_solver, solver, filepath,
+                            *self._solver_options()
+                        )
 
-                    # ===== Branch and Bound =====
-                    t0 = time.perf_counter()
-                    bb_value = solve_bb(filepath)
-                    bb_time = time.perf_counter() - t0
+            for category in sorted(instances_by_category.keys()):
+                print(f"Categoria: {category}")
+                print("-" * 100)
 
-                    # ===== Backtracking =====
-                    t0 = time.perf_counter()
-                    bt_value, _ = solve_backtracking_2d(
-                        max_weight, max_volume, weights, volumes, values
-                    )
-                    bt_time = time.perf_counter() - t0
+                for filepath in sorted(instances_by_category[category]):
+                    name = os.path.basename(filepath)
+
+                    try:
+                        values, selections, times, optimal, stats = {}, {}, {}, {}, {}
+                        for solver in SOLVERS:
+                            values[solver], selections[solver], times[solver], \
+                                optimal[solver], stats[solver] = \
+                                futures[(filepath, solver)].result()
 
-                    # ===== Checagem de corretude =====
-                    if not (dp_value == bb_value == bt_value):
-                        raise ValueError(
-                            f"Valores diferentes! "
-                            f"DP={dp_value}, BB={bb_value}, BT={bt_value}"
+                        self._record(
+                            category, filepath, load_item_set(filepath),
+                            values, selections, times, optimal, stats
                         )
 
-                    self.results.append({
-                        'categoria': category,
-                        'instancia': name,
-                        'n_itens': len(items),
-                        'peso_max': max_weight,
-                        'volume_max': max_volume,
-                        'valor_maximo': dp_value,
-                        'tempo_dp': dp_time,
-                        'tempo_bb': bb_time,
-                        'tempo_bt': bt_time
-                    })
-
-                    print(
-                        f"  OK {name:30} | "
-                        f"Valor: {dp_value:6} | "
-                        f"DP: {dp_time*1000:8.2f}ms | "
-                        f"BB: {bb_time*1000:8.2f}ms | "
-                        f"BT: {bt_time*1000:8.2f}ms"
-                    )
+                    except Exception as e:
+                        print(f"  ERR {name:30} | Erro: {e}")
+
+    def _solver_options(self):
+        # Argumentos extras de run_solver e measure_solver, na ordem
+        return (
+            self.repeats, self.warmup, self.time_limit, self.max_nodes,
+            self.profile
+        )
+
+    def _record(self, category, filepath, instance, values, selections, times,
+                optimal, stats):
+        # Confere os valores dos três solvers e guarda a linha do resultado
+        # instance: (W, V, itens) já carregada
+        name = os.path.basename(filepath)
+        max_weight, max_volume, items = instance
+
+        dp_value, bb_value, bt_value = values["dp"], values["bb"], values["bt"]
+
+        # Ótimo de referência: o da DP ou, com cache, o guardado (na
+        # primeira vez o resultado da DP que acabou de rodar fica no cache)
+        reference = dp_value
+        if self.cache is not None:
+            hit = self.cache.get(max_weight, max_volume, items, "dp")
+            if hit is None:
+                self.cache.put(
+                    max_weight, max_volume, items, "dp", dp_value, selections["dp"]
+                )
+            else:
+                reference = hit[0]
+
+        # ===== Checagem de corretude =====
+        # Solver interrompido pelo limite só precisa não passar do ótimo
+        consistent = all(
+            values[solver] == reference if optimal[solver]
+            else values[solver] <= reference
+            for solver in SOLVERS
+        )
+        if not consistent:
+            raise ValueError(
+                f"Valores diferentes! Ótimo={reference}, "
+                f"DP={dp_value}, BB={bb_value}, BT={bt_value}"
+            )
 
-                except Exception as e:
-                    print(f"  ERR {name:30} | Erro: {e}")
+        result = {
+            'categoria': category,
+            'instancia': name,
+            'n_itens': len(items),
+            'peso_max': max_weight,
+            'volume_max': max_volume,
+            'valor_maximo': dp_value,
+            'otimo_bb': optimal["bb"],
+            'otimo_bt': optimal["bt"],
+        }
+
+        # tempo_<solver> é a mediana das repetições
+        for solver in SOLVERS:
+            median, p95, ci95 = summarize_times(times[solver])
+            result[f'tempo_{solver}'] = median
+            result[f'tempo_{solver}_p95'] = p95
+            result[f'tempo_{solver}_ci95'] = ci95
+
+            # estatísticas do solver (só com profile)
+            if stats[solver] is not None:
+                for prefix, key, suffix in STAT_COLUMNS:
+                    result[stat_column(prefix, solver, suffix)] = \
+                        format_stat(key, stats[solver][key])
+
+        self.results.append(result)
+
+        dp_time, bb_time, bt_time = (
+            result['tempo_dp'], result['tempo_bb'], result['tempo_bt']
+        )
+
+        # * = parou no limite de tempo/nós sem provar o ótimo
+        bb_mark = " " if optimal["bb"] else "*"
+        bt_mark = " " if optimal["bt"] else "*"
+
+        print(
+            f"  OK {name:30} | "
+            f"Valor: {dp_value:6} | "
+            f"DP: {dp_time*1000:8.2f}ms | "
+            f"BB: {bb_time*1000:8.2f}ms{bb_mark}| "
+            f"BT: {bt_time*1000:8.2f}ms{bt_mark}"
+        )
 
     def _group_instances_by_category(self):
         categories = {}
@@ -110,6 +383,21 @@ class BenchmarkRunner:
             print("Nenhum resultado para salvar!")
             return
 
+        # tempo_*_ms é a mediana; p95 e meia-largura do IC 95% ao lado
+        time_fields = []
+        for solver in SOLVERS:
+            time_fields.append(f'tempo_{solver}_ms')
+        for suffix in ('p95', 'ci95'):
+            for solver in SOLVERS:
+                time_fields.append(f'tempo_{solver}_{suffix}_ms')
+
+        # colunas de estatística no fim, por solver (só com profile)
+        stat_fields = []
+        if self.profile:
+            for solver in SOLVERS:
+                for prefix, _, suffix in STAT_COLUMNS:
+                    stat_fields.append(stat_column(prefix, solver, suffix))
+
         with open(filename, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=[
                 'instancia',
@@ -117,23 +405,27 @@ class BenchmarkRunner:
                 'peso_max',
                 'volume_max',
                 'valor_maximo',
-                'tempo_dp_ms',
-                'tempo_bb_ms',
-                'tempo_bt_ms'
-            ])
+            ] + time_fields + ['otimo_bb', 'otimo_bt'] + stat_fields)
             writer.writeheader()
 
             for r in sorted(self.results, key=lambda x: (x['n_itens'], x['instancia'])):
-                writer.writerow({
+                row = {
                     'instancia': r['instancia'],
                     'n_itens': r['n_itens'],
                     'peso_max': r['peso_max'],
                     'volume_max': r['volume_max'],
                     'valor_maximo': r['valor_maximo'],
-                    'tempo_dp_ms': f"{r['tempo_dp']*1000:.2f}",
-                    'tempo_bb_ms': f"{r['tempo_bb']*1000:.2f}",
-                    'tempo_bt_ms': f"{r['tempo_bt']*1000:.2f}",
-                })
+                    'otimo_bb': int(r['otimo_bb']),
+                    'otimo_bt': int(r['otimo_bt']),
+                }
+                for solver in SOLVERS:
+                    row[f'tempo_{solver}_ms'] = f"{r[f'tempo_{solver}']*1000:.2f}"
+                    for suffix in ('p95', 'ci95'):
+                        row[f'tempo_{solver}_{suffix}_ms'] = \
+                            f"{r[f'tempo_{solver}_{suffix}']*1000:.2f}"
+                for field in stat_fields:
+                    row[field] = r[field]
+                writer.writerow(row)
 
         print(f"\nBenchmark salvo em: {filename}")
 
@@ -166,10 +458,69 @@ class BenchmarkRunner:
             )
 
 
+def positive_int(text):
+    # Tipo do argparse: inteiro >= 1
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"precisa ser pelo menos 1: {text}")
+    return value
+
+
+def non_negative_int(text):
+    # Tipo do argparse: inteiro >= 0
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"não pode ser negativo: {text}")
+    return value
+
+
 def main():
-    runner = BenchmarkRunner()
-    runner.run_all_instances()
-    runner.save_benchmark_csv()
+    parser = argparse.ArgumentParser(description="Benchmark DP vs BB vs BT")
+    parser.add_argument("--dir", default="instancias", help="diretório das instâncias")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="processos em paralelo (um par instância/solver por vez em cada)"
+    )
+    parser.add_argument("--output", default="benchmark_dp_bb_bt.csv", help="CSV de saída")
+    parser.add_argument(
+        "--repeats", type=positive_int, default=1,
+        help="execuções medidas por solver (tempo reportado = mediana)"
+    )
+    parser.add_argument(
+        "--warmup", type=non_negative_int, default=0,
+        help="execuções descartadas antes das medidas"
+    )
+    parser.add_argument(
+        "--time-limit", type=float, default=None,
+        help="limite de tempo (s) por execução de BB e BT"
+    )
+    parser.add_argument(
+        "--max-nodes", type=int, default=None,
+        help="limite de nós por execução de BB e BT"
+    )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="roda cada solver mais uma vez (fora da medição) e grava nós, "
+             "podas, bounds, células da DP, pico de memória e incumbentes"
+    )
+    parser.add_argument(
+        "--cache", default=None, metavar="ARQUIVO",
+        help="banco SQLite do solution_cache: os valores são conferidos "
+             "contra o ótimo guardado (instâncias novas são resolvidas pela "
+             "DP uma vez e guardadas)"
+    )
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner(
+        args.dir, args.repeats, args.warmup, args.time_limit, args.max_nodes,
+        args.stats, args.cache
+    )
+    try:
+        runner.run_all_instances(jobs=args.jobs)
+    finally:
+        if runner.cache is not None:
+            runner.cache.close()
+    runner.save_benchmark_csv(args.output)
     runner.print_summary()
 
 
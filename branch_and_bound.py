@@ -1,7 +1,23 @@
 # branch_and_bound.py
 # Solver Branch and Bound para Mochila 0-1 com duas restrições (peso e volume)
 
+import heapq
+import math
+import multiprocessing
+import os
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from heuristics import heuristic_solution
+from item_set import ItemSet
+from search_engine import depth_first_search
+from solver_stats import add_counts, incumbent_recorder, new_stats, timed_bound
+
 class Item:
+    __slots__ = ("w", "v", "val", "ratio")
+
     def __init__(self, peso, volume, valor):
         self.w = peso
         self.v = volume
@@ -32,86 +48,779 @@ def read_instance(filepath):
 
 
 def bound(items, idx, W, V, cur_w, cur_v, cur_val):
+    # items: lista de Item (ou ItemSet) já na ordem por densidade
+    # (a busca usa make_classic_bound, que dá o mesmo valor em O(log n))
+    if isinstance(items, ItemSet):
+        weights, volumes, values = items.weights, items.volumes, items.values
+    else:
+        weights = [it.w for it in items]
+        volumes = [it.v for it in items]
+        values = [it.val for it in items]
+    return _column_bound(weights, volumes, values, idx, W, V, cur_w, cur_v, cur_val)
+
+
+def _column_bound(weights, volumes, values, idx, W, V, cur_w, cur_v, cur_val):
+    # bound() sobre as colunas
+    n = len(values)
+
     # ----- Bound por PESO -----
     value_w = cur_val
     w = cur_w
 
-    for i in range(idx, len(items)):
-        if w + items[i].w <= W:
-            w += items[i].w
-            value_w += items[i].val
+    for i in range(idx, n):
+        if w + weights[i] <= W:
+            w += weights[i]
+            value_w += values[i]
         else:
             remain = W - w
-            value_w += items[i].val * (remain / items[i].w)
+            value_w += values[i] * (remain / weights[i])
             break
 
     # ----- Bound por VOLUME -----
     value_v = cur_val
     v = cur_v
 
-    for i in range(idx, len(items)):
-        if v + items[i].v <= V:
-            v += items[i].v
-            value_v += items[i].val
+    for i in range(idx, n):
+        if v + volumes[i] <= V:
+            v += volumes[i]
+            value_v += values[i]
         else:
             remain = V - v
-            value_v += items[i].val * (remain / items[i].v)
+            value_v += values[i] * (remain / volumes[i])
             break
 
     # bound otimista
     return max(value_w, value_v)
 
 
-def solve_instance(filepath):
+def make_classic_bound(items, W, V):
     """
-    Recebe o caminho da instância e retorna o valor ótimo
+    Devolve bound_fn(idx, cur_w, cur_v, cur_val) com o mesmo valor de
+    bound(items, idx, ...) (ItemSet já na ordem por densidade).
+
+    O guloso de cada restrição a partir de idx pega um intervalo contíguo
+    até o primeiro item que não cabe: somas de prefixo (inteiras, então o
+    valor sai idêntico ao do laço) + bisect dão o bound em O(log n) por nó.
+    """
+    weights, volumes, values = items.weights, items.volumes, items.values
+    n = len(values)
+
+    prefix_w = [0] * (n + 1)
+    prefix_v = [0] * (n + 1)
+    prefix_val = [0] * (n + 1)
+    for i in range(n):
+        prefix_w[i + 1] = prefix_w[i] + weights[i]
+        prefix_v[i + 1] = prefix_v[i] + volumes[i]
+        prefix_val[i + 1] = prefix_val[i] + values[i]
+
+    def bound_fn(idx, cur_w, cur_v, cur_val):
+        base = cur_val - prefix_val[idx]
+
+        # ----- Bound por PESO -----
+        target = prefix_w[idx] + W - cur_w
+        k = bisect_right(prefix_w, target, idx) - 1
+        value_w = base + prefix_val[k]
+        if k < n:
+            value_w += values[k] * ((target - prefix_w[k]) / weights[k])
+
+        # ----- Bound por VOLUME -----
+        target = prefix_v[idx] + V - cur_v
+        k = bisect_right(prefix_v, target, idx) - 1
+        value_v = base + prefix_val[k]
+        if k < n:
+            value_v += values[k] * ((target - prefix_v[k]) / volumes[k])
+
+        # bound otimista
+        return max(value_w, value_v)
+
+    return bound_fn
+
+
+def surrogate_weights(items, W, V, mu):
+    """
+    Pesos da restrição surrogate (normalizada pra capacidade 1):
+    (1 - mu) * w / W + mu * v / V <= 1
+    Toda solução viável nas duas restrições também é viável aqui.
+    Capacidade zero conta como 1 (como em preprocessing): a restrição fica
+    mais frouxa, mas continua valendo pra toda solução viável.
+    """
+    a = (1 - mu) / max(W, 1)
+    b = mu / max(V, 1)
+    return [a * w + b * v for w, v in zip(items.weights, items.volumes)]
+
+
+def surrogate_order(items, W, V, mu):
+    # Índices por valor / peso surrogate, decrescente (empates na ordem
+    # por densidade, ItemSet.ratio_order)
+    s = surrogate_weights(items, W, V, mu)
+    values = items.values
+    return sorted(items.ratio_order, key=lambda i: values[i] / s[i], reverse=True)
+
+
+def surrogate_root_bound(items, W, V, mu):
+    # bound fracionário (Dantzig) da raiz pra um multiplicador mu
+    s = surrogate_weights(items, W, V, mu)
+    values = items.values
+
+    remain = 1.0
+    value = 0.0
+    for i in surrogate_order(items, W, V, mu):
+        if s[i] <= remain:
+            remain -= s[i]
+            value += values[i]
+        else:
+            value += values[i] * (remain / s[i])
+            break
+
+    return value
+
+
+def tune_multiplier(items, W, V, steps=10):
+    """
+    Escolhe o mu em [0, 1] que minimiza o bound surrogate da raiz:
+    uma grade grossa seguida de uma grade fina em volta do melhor ponto.
+    mu = 0 é o bound só por peso e mu = 1 só por volume.
     """
-    W, V, items = read_instance(filepath)
+    candidates = [k / steps for k in range(steps + 1)]
+    best_mu = min(candidates, key=lambda mu: surrogate_root_bound(items, W, V, mu))
+
+    lo = max(0.0, best_mu - 1 / steps)
+    hi = min(1.0, best_mu + 1 / steps)
+    candidates = [lo + (hi - lo) * k / steps for k in range(steps + 1)]
+
+    return min(candidates, key=lambda mu: surrogate_root_bound(items, W, V, mu))
+
+
+def make_surrogate_bound(items, W, V, mu):
+    """
+    Devolve bound_fn(idx, cur_w, cur_v, cur_val) com o bound fracionário
+    da relaxação surrogate sobre items[idx:] (ItemSet já na ordem de
+    surrogate_order).
+
+    Com a ordem fixa, o guloso a partir de idx é um intervalo contíguo:
+    as somas de prefixo + bisect dão o bound em O(log n) por nó.
+    """
+    a = (1 - mu) / max(W, 1)
+    b = mu / max(V, 1)
+
+    s = surrogate_weights(items, W, V, mu)
+    values = items.values
+    n = len(values)
+
+    prefix_s = [0.0] * (n + 1)
+    prefix_val = [0] * (n + 1)
+    for i in range(n):
+        prefix_s[i + 1] = prefix_s[i] + s[i]
+        prefix_val[i + 1] = prefix_val[i] + values[i]
+
+    def bound_fn(idx, cur_w, cur_v, cur_val):
+        remain = 1.0 - (a * cur_w + b * cur_v)
+        target = prefix_s[idx] + remain
+
+        # último prefixo que cabe inteiro
+        k = bisect_right(prefix_s, target, idx) - 1
+        value = cur_val + prefix_val[k] - prefix_val[idx]
+
+        # fração do item crítico
+        if k < n:
+            value += values[k] * ((target - prefix_s[k]) / s[k])
+
+        return value
+
+    return bound_fn
+
+
+def setup_bound(items, W, V, bound_mode="classic", mu=None):
+    """
+    Escolhe a ordem de ramificação dos itens (ItemSet) e monta o bound.
+
+    Retorna (order, ordered, bound_fn): order[k] é o índice em items do
+    k-ésimo item da ramificação, ordered = items.take(order) (as colunas
+    que o bound e as buscas indexam direto) e bound_fn(idx, cur_w, cur_v,
+    cur_val) limita o que ordered[idx:] ainda pode somar.
+
+    bound_mode: "classic" (max dos bounds por peso e por volume, itens
+    por densidade) ou "surrogate" (relaxação surrogate com mu ajustado;
+    passe mu pra fixar o multiplicador em vez de ajustá-lo)
+    """
+    if bound_mode == "surrogate":
+        if mu is None:
+            mu = tune_multiplier(items, W, V)
+        order = surrogate_order(items, W, V, mu)
+        ordered = items.take(order)
+        bound_fn = make_surrogate_bound(ordered, W, V, mu)
+        bound_fn.mu = mu
+        return order, ordered, bound_fn
+    if bound_mode != "classic":
+        raise ValueError(f"Bound desconhecido: {bound_mode}")
 
     # ordena por densidade
-    items.sort(key=lambda x: x.ratio, reverse=True)
+    order = items.ratio_order
+    ordered = items.take(order)
+    return order, ordered, make_classic_bound(ordered, W, V)
+
+
+def best_first(items, W, V, bound_fn, max_open_nodes=100000,
+               time_limit=None, max_nodes=None, best_value=0,
+               on_improve=None, stats=None):
+    """
+    Busca best-first: sempre expande o nó aberto de maior bound.
+    Os nós ficam num pool de arrays compactos (índice, peso, volume, valor)
+    e a heap guarda só (-bound, id do nó). Quando a fila aberta passa de
+    max_open_nodes, o nó retirado é resolvido em profundidade
+    (depth_first_search), o que limita a memória sem perder a otimalidade.
+
+    time_limit (segundos) e max_nodes interrompem a busca, que então
+    devolve o incumbente atual e o maior bound ainda aberto. best_value
+    é o incumbente inicial; on_improve(valor) e stats funcionam como em
+    depth_first_search.
+
+    Espera os itens (ItemSet) já na ordem do bound_fn (ver setup_bound).
+    Retorna (best, selected, node_count, upper_bound), com selected as
+    posições dos itens da melhor solução (None se nada supera best_value).
+    """
+    n = len(items)
+    weights, volumes, values = items.weights, items.volumes, items.values
+
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    node_count = 0
+    pruned_infeasible = 0
+    pruned_bound = 0
+    bound_evals = 0
+    # as subárvores em profundidade medem o próprio bound
+    search_bound = bound_fn
+    bound_fn = timed_bound(bound_fn, stats)
+    # bound das subárvores resolvidas em profundidade e interrompidas
+    fallback_bound = 0
+
+    # pool de nós em arrays paralelos; ids livres são reaproveitados
+    # node_mask guarda os itens incluídos (bit k = posição k)
+    node_idx = array("q")
+    node_w = array("q")
+    node_v = array("q")
+    node_val = array("q")
+    node_mask = []
+    free = []
+
+    def new_node(idx, cur_w, cur_v, cur_val, mask):
+        if free:
+            node = free.pop()
+            node_idx[node] = idx
+            node_w[node] = cur_w
+            node_v[node] = cur_v
+            node_val[node] = cur_val
+            node_mask[node] = mask
+        else:
+            node = len(node_idx)
+            node_idx.append(idx)
+            node_w.append(cur_w)
+            node_v.append(cur_v)
+            node_val.append(cur_val)
+            node_mask.append(mask)
+        return node
+
+    # toda solução parcial viável já é um incumbente válido
+    best = best_value
+    best_selected = None
+    heap = []
+
+    if n > 0:
+        bound_evals += 1
+        root_bound = bound_fn(0, 0, 0, 0)
+        if root_bound > best:
+            heap.append((-root_bound, new_node(0, 0, 0, 0, 0)))
+
+    while heap:
+        # orçamento de nós / tempo esgotado: a fila continua aberta
+        if (max_nodes is not None and node_count >= max_nodes) or (
+            deadline is not None and time.perf_counter() > deadline
+        ):
+            break
+
+        neg_bound, node = heapq.heappop(heap)
+        node_count += 1
+
+        # o melhor bound aberto não supera o incumbente: ótimo provado
+        if -neg_bound <= best:
+            pruned_bound += 1
+            break
+
+        idx = node_idx[node]
+        cur_w = node_w[node]
+        cur_v = node_v[node]
+        cur_val = node_val[node]
+        mask = node_mask[node]
+        free.append(node)
+
+        # fila cheia: resolve esse nó em profundidade
+        if len(heap) >= max_open_nodes:
+            best, sub_selected, sub_nodes, sub_bound = depth_first_search(
+                W, V, weights, volumes, values, search_bound, best,
+                idx, cur_w, cur_v, cur_val, on_improve=on_improve,
+                time_limit=(
+                    max(0.0, deadline - time.perf_counter())
+                    if deadline is not None else None
+                ),
+                max_nodes=(
+                    max_nodes - node_count if max_nodes is not None else None
+                ),
+                stats=stats
+            )
+            node_count += sub_nodes
+            fallback_bound = max(fallback_bound, sub_bound)
+            if sub_selected is not None:
+                best_selected = mask_positions(mask, idx) + sub_selected
+            continue
+
+        children = (
+            (cur_w + weights[idx], cur_v + volumes[idx], cur_val + values[idx],
+             mask | (1 << idx)),
+            (cur_w, cur_v, cur_val, mask),
+        )
+
+        for child_w, child_v, child_val, child_mask in children:
+            # viola restrições
+            if child_w > W or child_v > V:
+                pruned_infeasible += 1
+                continue
+
+            if child_val > best:
+                best = child_val
+                best_selected = mask_positions(child_mask, idx + 1)
+                if on_improve is not None:
+                    on_improve(best)
+
+            # fim da árvore
+            if idx + 1 == n:
+                continue
+
+            bound_evals += 1
+            child_bound = bound_fn(idx + 1, child_w, child_v, child_val)
+            if child_bound > best:
+                heapq.heappush(
+                    heap,
+                    (-child_bound,
+                     new_node(idx + 1, child_w, child_v, child_val, child_mask))
+                )
+            else:
+                pruned_bound += 1
+
+    if stats is not None:
+        add_counts(
+            stats,
+            pruned_infeasible=pruned_infeasible,
+            pruned_bound=pruned_bound,
+            bound_evals=bound_evals
+        )
+
+    # o topo da heap é o maior bound aberto (<= best se a busca terminou)
+    upper_bound = max(best, fallback_bound)
+    if heap:
+        upper_bound = max(upper_bound, math.floor(-heap[0][0] + 1e-6))
+
+    return best, best_selected, node_count, upper_bound
 
-    best = 0
 
-    def dfs(idx, cur_w, cur_v, cur_val):
-        nonlocal best
+def mask_positions(mask, n):
+    # Posições (< n) dos bits ligados em mask
+    return [k for k in range(n) if mask >> k & 1]
 
-        # viola restrições
-        if cur_w > W or cur_v > V:
-            return
 
-        # fim da árvore
-        if idx == len(items):
-            if cur_val > best:
-                best = cur_val
-            return
+def split_tree(W, V, weights, volumes, values, bound_fn, split_depth,
+               best_value=0, stats=None):
+    """
+    Expande a árvore em largura até split_depth e devolve
+    (best, best_selected, frontier, node_count): o melhor valor (parcial
+    ou o incumbente best_value) com as posições dos itens (None se for o
+    incumbente) e os nós (idx, cur_w, cur_v, cur_val, mask) que
+    sobreviveram à poda, do maior bound pro menor. mask tem o bit k ligado
+    se o item k foi incluído. stats funciona como em depth_first_search.
+    """
+    n = len(values)
+    best = best_value
+    best_selected = None
+    frontier = [(0, 0, 0, 0, 0)]
+    node_count = 1
+    pruned_infeasible = 0
+    bound_fn = timed_bound(bound_fn, stats)
+
+    for idx in range(min(split_depth, n)):
+        children = []
+
+        for _, cur_w, cur_v, cur_val, mask in frontier:
+            for child in (
+                (cur_w + weights[idx], cur_v + volumes[idx], cur_val + values[idx],
+                 mask | (1 << idx)),
+                (cur_w, cur_v, cur_val, mask),
+            ):
+                child_w, child_v, child_val, child_mask = child
+
+                # viola restrições
+                if child_w > W or child_v > V:
+                    pruned_infeasible += 1
+                    continue
 
-        # poda por limite superior
-        if bound(items, idx, W, V, cur_w, cur_v, cur_val) <= best:
-            return
+                if child_val > best:
+                    best = child_val
+                    best_selected = mask_positions(child_mask, idx + 1)
+                children.append((idx + 1, child_w, child_v, child_val, child_mask))
 
-        # ramo: inclui item
-        dfs(
-            idx + 1,
-            cur_w + items[idx].w,
-            cur_v + items[idx].v,
-            cur_val + items[idx].val
+        frontier = children
+        node_count += len(children)
+
+    ranked = []
+    for node in frontier:
+        node_bound = bound_fn(*node[:4])
+        if node_bound > best:
+            ranked.append((node_bound, node))
+    ranked.sort(key=lambda x: x[0], reverse=True)
+
+    if stats is not None:
+        add_counts(
+            stats,
+            pruned_infeasible=pruned_infeasible,
+            pruned_bound=len(frontier) - len(ranked),
+            bound_evals=len(frontier)
         )
 
-        # ramo: exclui item
-        dfs(idx + 1, cur_w, cur_v, cur_val)
+    return best, best_selected, [node for _, node in ranked], node_count
+
+
+# estado de cada processo do pool (preenchido por init_worker)
+_worker = {}
+
+
+def init_worker(shared_best, W, V, items, bound_mode, mu):
+    # Os itens chegam já ordenados; setup_bound com o mesmo mu mantém
+    # a ordem (sort estável), então os índices dos nós batem com o pai
+    _, ordered, bound_fn = setup_bound(items, W, V, bound_mode, mu)
+
+    _worker["shared_best"] = shared_best
+    _worker["problem"] = (
+        W,
+        V,
+        ordered.weights,
+        ordered.volumes,
+        ordered.values,
+        bound_fn,
+    )
+
+
+def solve_subtree(task):
+    """
+    Resolve a subárvore de um nó num processo do pool, podando com o
+    incumbente global compartilhado entre todos os processos.
+
+    task = (nó, deadline em time.time() ou None, orçamento de nós ou None,
+    perfilar o bound)
+    Retorna (best, selected, node_count, upper_bound, stats) da subárvore:
+    os quatro primeiros como em depth_first_search e stats com os
+    contadores e as melhoras (time.time(), valor) achadas aqui.
+    """
+    node, deadline, max_nodes, profile = task
+    shared_best = _worker["shared_best"]
+    W, V, weights, volumes, values, bound_fn = _worker["problem"]
+
+    # leitura sem lock: um valor velho só poda menos, nunca errado
+    global_best = shared_best.get_obj()
+
+    def shared_bound(idx, cur_w, cur_v, cur_val):
+        node_bound = bound_fn(idx, cur_w, cur_v, cur_val)
+        # incumbente global já alcança esse bound: força a poda
+        if node_bound <= global_best.value:
+            return -1
+        return node_bound
+
+    stats = new_stats() if profile else {}
+    stats["incumbents"] = []
 
-    dfs(0, 0, 0, 0)
+    def publish(value):
+        stats["incumbents"].append((time.time(), value))
+        with shared_best.get_lock():
+            if value > global_best.value:
+                global_best.value = value
+
+    # relógio de parede: o deadline vem de outro processo
+    time_limit = None
+    if deadline is not None:
+        time_limit = max(0.0, deadline - time.time())
+
+    idx, cur_w, cur_v, cur_val = node
+    result = depth_first_search(
+        W, V, weights, volumes, values, shared_bound, global_best.value,
+        idx, cur_w, cur_v, cur_val, on_improve=publish,
+        time_limit=time_limit, max_nodes=max_nodes, stats=stats
+    )
+    return result + (stats,)
+
+
+def parallel_search(items, W, V, bound_fn, bound_mode="classic",
+                    workers=None, split_depth=None, time_limit=None,
+                    max_nodes=None, best_value=0, on_improve=None,
+                    stats=None):
+    """
+    Branch and Bound paralelo: divide a árvore em split_depth e resolve
+    os subproblemas num pool de processos. O melhor valor fica num
+    multiprocessing.Value compartilhado, então todo processo poda com o
+    incumbente global.
+
+    time_limit vale pra busca toda; max_nodes é dividido igualmente
+    entre os subproblemas. best_value é o incumbente inicial; os
+    contadores dos processos são somados em stats e as melhoras deles
+    entram na linha do tempo de stats["incumbents"] (on_improve é chamado
+    só pras melhoras achadas neste processo).
+
+    Espera os itens (ItemSet) já na ordem do bound_fn (ver setup_bound).
+    Retorna (best, selected, node_count, upper_bound), como best_first.
+    """
+    wall_start = time.time()
+    deadline = wall_start + time_limit if time_limit is not None else None
+    workers = workers or os.cpu_count() or 1
+    weights, volumes, values = items.weights, items.volumes, items.values
+
+    # ~8 subproblemas por processo equilibra a carga
+    if split_depth is None:
+        split_depth = max(1, (workers * 8 - 1).bit_length())
+
+    best, best_selected, frontier, node_count = split_tree(
+        W, V, weights, volumes, values, bound_fn, split_depth, best_value,
+        stats
+    )
+    if best > best_value and on_improve is not None:
+        on_improve(best)
+    if not frontier:
+        return best, best_selected, node_count, best
+
+    sub_max_nodes = None
+    if max_nodes is not None:
+        sub_max_nodes = max(1, -(-max_nodes // len(frontier)))
+    profile = stats is not None and "bound_time" in stats
+    tasks = [(node[:4], deadline, sub_max_nodes, profile) for node in frontier]
+    upper_bound = best
+
+    shared_best = multiprocessing.Value("q", best)
+    initargs = (shared_best, W, V, items, bound_mode, getattr(bound_fn, "mu", None))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=initargs
+    ) as pool:
+        results = pool.map(solve_subtree, tasks)
+        for node, (sub_best, sub_selected, sub_nodes, sub_bound, sub_stats) in zip(
+            frontier, results
+        ):
+            if stats is not None:
+                timeline = stats.setdefault("incumbents", [])
+                timeline.extend(
+                    (wall_time - wall_start, value)
+                    for wall_time, value in sub_stats.pop("incumbents")
+                )
+                add_counts(stats, **sub_stats)
+
+            # quem achou o melhor global devolve a seleção (os outros
+            # devolvem None ou um valor menor)
+            if sub_selected is not None and sub_best > best:
+                best = sub_best
+                best_selected = mask_positions(node[4], node[0]) + sub_selected
+            node_count += sub_nodes
+            upper_bound = max(upper_bound, sub_bound)
+
+    if stats is not None:
+        stats["incumbents"].sort()
+    return best, best_selected, node_count, max(best, upper_bound)
+
+
+def search(items, W, V, strategy="dfs", max_open_nodes=100000,
+           bound_mode="classic", workers=None, split_depth=None,
+           time_limit=None, max_nodes=None, stats=None,
+           best_value=0, best_selection=None):
+    """
+    Núcleo comum de solve_items e solve: escolhe a ordem e o bound
+    (setup_bound) e roda a estratégia pedida sobre as colunas do ItemSet
+    items, a partir do incumbente best_value, cujos índices em items são
+    best_selection (None se só o valor é conhecido).
+
+    Retorna (best, chosen, node_count, upper_bound), com chosen os índices
+    em items da melhor solução, em ordem (best_selection se nada superou
+    o incumbente).
+    stats recebe também os contadores de solver_stats e a linha do tempo
+    das melhoras (a primeira é o incumbente inicial, se houver).
+    """
+    record = incumbent_recorder(stats, time.perf_counter())
+    if record is not None and best_value > 0:
+        record(best_value)
+
+    order, ordered, bound_fn = setup_bound(items, W, V, bound_mode)
+
+    if strategy == "best_first":
+        best, selected, node_count, upper_bound = best_first(
+            ordered, W, V, bound_fn, max_open_nodes, time_limit, max_nodes,
+            best_value, record, stats
+        )
+    elif strategy == "parallel":
+        best, selected, node_count, upper_bound = parallel_search(
+            ordered, W, V, bound_fn, bound_mode, workers, split_depth,
+            time_limit, max_nodes, best_value, record, stats
+        )
+    elif strategy == "dfs":
+        best, selected, node_count, upper_bound = depth_first_search(
+            W,
+            V,
+            ordered.weights,
+            ordered.volumes,
+            ordered.values,
+            bound_fn,
+            best_value,
+            on_improve=record,
+            time_limit=time_limit,
+            max_nodes=max_nodes,
+            stats=stats
+        )
+    else:
+        raise ValueError(f"Estratégia desconhecida: {strategy}")
+
+    # O bound clássico não é monótono (um nó pode ter bound maior que o
+    # pai): o limite dos nós abertos fica limitado pelo bound da raiz
+    upper_bound = min(upper_bound, max(best, bound_fn(0, 0, 0, 0)))
+
+    chosen = best_selection
+    if selected is not None:
+        chosen = sorted(order[k] for k in selected)
+
+    if stats is not None:
+        stats["node_count"] = node_count
+        stats["optimal"] = upper_bound <= best
+        stats["upper_bound"] = upper_bound
+        stats["gap"] = (upper_bound - best) / upper_bound if upper_bound > 0 else 0.0
+
+    return best, chosen, node_count, upper_bound
+
+
+def solve_items(W, V, items, strategy="dfs", max_open_nodes=100000,
+                bound_mode="classic", workers=None, split_depth=None,
+                time_limit=None, max_nodes=None, stats=None,
+                initial_value=0, warm_start=True):
+    """
+    Resolve uma instância já lida (lista de Item ou ItemSet) e retorna o
+    valor ótimo
+
+    strategy: "dfs" (profundidade, via depth_first_search), "best_first"
+    (fila de prioridade pelo bound, limitada a max_open_nodes nós abertos)
+    ou "parallel" (subárvores em workers processos, ver parallel_search)
+    bound_mode: "classic" ou "surrogate" (ver setup_bound)
+
+    time_limit (segundos) e max_nodes limitam a busca: ao estourar,
+    retorna o melhor valor achado até ali. Se stats for um dict, recebe
+    node_count, optimal (otimalidade provada), upper_bound,
+    gap = (upper_bound - valor) / upper_bound e as estatísticas de
+    solver_stats (podas, bounds, linha do tempo do incumbente).
+
+    initial_value é o valor de uma solução viável já conhecida (incumbente
+    inicial). Com warm_start, heuristics.heuristic_solution também dá um
+    e fica o maior: nós com bound <= incumbente são podados desde a raiz.
+    """
+    if not isinstance(items, ItemSet):
+        items = ItemSet(
+            [it.w for it in items], [it.v for it in items], [it.val for it in items]
+        )
+
+    best_value = initial_value
+    if warm_start:
+        heuristic_value, _ = heuristic_solution(W, V, items.tolist())
+        best_value = max(best_value, heuristic_value)
+
+    best, _, _, _ = search(
+        items, W, V, strategy, max_open_nodes, bound_mode, workers,
+        split_depth, time_limit, max_nodes, stats, best_value
+    )
+    return best
+
+
+def solve(max_weight, max_volume, weights, volumes=None, values=None, strategy="dfs",
+          max_open_nodes=100000, bound_mode="classic", workers=None,
+          split_depth=None, time_limit=None, max_nodes=None, stats=None,
+          initial_selection=None, warm_start=True):
+    """
+    Resolve uma instância em memória (listas paralelas de peso, volume e
+    valor, ou um ItemSet no lugar de weights), sem tocar em disco.
+
+    initial_selection (índices das listas) é uma solução viável usada
+    como incumbente inicial; com warm_start a heurística também dá uma e
+    fica a melhor. As demais opções são as de solve_items.
+
+    Retorna (max_value, selected, node_count, execution_time), com
+    selected os índices originais dos itens escolhidos, em ordem.
+    """
+    start_time = time.perf_counter()
+
+    items = weights if isinstance(weights, ItemSet) else \
+        ItemSet(weights, volumes, values)
+    weights, volumes, values = items.weights, items.volumes, items.values
+
+    incumbent = []
+    if initial_selection is not None:
+        incumbent = sorted(set(initial_selection))
+        if sum(weights[i] for i in incumbent) > max_weight or \
+           sum(volumes[i] for i in incumbent) > max_volume:
+            raise ValueError("initial_selection não cabe na mochila")
+    if warm_start:
+        heuristic_value, chosen = heuristic_solution(
+            max_weight, max_volume, items.tolist()
+        )
+        if heuristic_value > sum(values[i] for i in incumbent):
+            incumbent = chosen
+
+    best, selected, node_count, _ = search(
+        items, max_weight, max_volume, strategy, max_open_nodes, bound_mode,
+        workers, split_depth, time_limit, max_nodes, stats,
+        sum(values[i] for i in incumbent), incumbent
+    )
+
+    return best, selected, node_count, time.perf_counter() - start_time
+
+
+def solve_instance(filepath, strategy="dfs", max_open_nodes=100000,
+                   bound_mode="classic", workers=None, split_depth=None,
+                   time_limit=None, max_nodes=None, stats=None,
+                   initial_selection=None, warm_start=True):
+    """
+    Recebe o caminho da instância e retorna o valor ótimo
+    (lê o arquivo com instance_loader e chama solve, com as mesmas opções)
+    """
+    # import local: só a leitura de arquivo precisa do NumPy
+    from instance_loader import load_item_set
+
+    W, V, items = load_item_set(filepath)
+    best, _, _, _ = solve(
+        W, V, items, None, None, strategy, max_open_nodes, bound_mode,
+        workers, split_depth, time_limit, max_nodes, stats,
+        initial_selection, warm_start
+    )
     return best
 
 
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) != 2:
-        print("Uso: python branch_and_bound.py <arquivo_instancia>")
+    if len(sys.argv) not in (2, 3, 4):
+        print("Uso: python branch_and_bound.py <arquivo_instancia> "
+              "[dfs|best_first|parallel] [classic|surrogate]")
         sys.exit(1)
 
     instance_path = sys.argv[1]
-    result = solve_instance(instance_path)
+    strategy = sys.argv[2] if len(sys.argv) >= 3 else "dfs"
+    bound_mode = sys.argv[3] if len(sys.argv) == 4 else "classic"
+
+    from instance_loader import load_item_set
+
+    W, V, items = load_item_set(instance_path)
+    result, selected, node_count, execution_time = solve(
+        W, V, items, strategy=strategy, bound_mode=bound_mode
+    )
     print(f"Valor ótimo: {result}")
+    print(f"Itens selecionados: {selected}")
+    print(f"Nós visitados: {node_count}")
+    print(f"Tempo de execução: {execution_time:.6f} segundos")
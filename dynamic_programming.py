@@ -1,6 +1,12 @@
+import math
 import time
 import sys
 
+from branch_and_bound import setup_bound
+from heuristics import greedy_fill, greedy_orders
+from item_set import as_item_set
+from solver_stats import add_counts
+
 class MochilaDP:
     # Classe para resolver mochila 0-1 com duas restrições usando DP
     # Restrições: peso máximo W e volume máximo V
@@ -17,7 +23,7 @@ class MochilaDP:
         # Resolve o problema usando programação dinâmica
         # O(n * W * V) de tempo, O(n * W * V) de espaço
         
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         
         # Cria a tabela DP
         dp = [[0] * (self.max_volume + 1) for _ in range(self.max_weight + 1)]
@@ -45,7 +51,7 @@ class MochilaDP:
         selected_items = self._trace_back(dp, parent)
         
         max_value = dp[self.max_weight][self.max_volume]
-        self.end_time = time.time()
+        self.end_time = time.perf_counter()
         execution_time = self.end_time - self.start_time
         
         return max_value, selected_items, execution_time
@@ -71,11 +77,13 @@ class MochilaDP:
         return selected
 
 
-def solve_with_traceback_3d(max_weight, max_volume, items):
+def solve_with_traceback_3d(max_weight, max_volume, items, stats=None):
     # Versão usando tabela 3D pra rastrear melhor
     # Complexidade: O(n * W * V) tempo, O(n * W * V) espaço
+    # Se stats for um dict, recebe dp_cells e a linha do tempo do
+    # incumbente (só o valor final; a DP não tem solução parcial)
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     n = len(items)
     
     # Tabela DP 3D: dp[i][w][v] = valor máximo usando itens 0..i-1
@@ -111,12 +119,184 @@ def solve_with_traceback_3d(max_weight, max_volume, items):
     selected.reverse()
     max_value = dp[n][max_weight][max_volume]
     
-    end_time = time.time()
+    end_time = time.perf_counter()
     execution_time = end_time - start_time
     
+    if stats is not None:
+        add_counts(stats, dp_cells=n * (max_weight + 1) * (max_volume + 1))
+        stats.setdefault("incumbents", []).append((execution_time, max_value))
+    
     return max_value, selected, execution_time
 
 
+def solve_pareto(max_weight, max_volume, items, stats=None):
+    # Versão esparsa: em vez da tabela W x V, guarda só os estados
+    # (peso, volume, valor) alcançáveis e não dominados de cada etapa.
+    # Um estado domina outro se usa peso e volume <= e vale >=.
+    # Complexidade: O(n * S log S), S = estados não dominados por etapa,
+    # bem menor que W * V quando as capacidades são grandes e n é modesto
+    # Com stats, dp_cells conta os estados candidatos examinados
+    
+    start_time = time.perf_counter()
+    
+    # Estado: (peso, volume, valor, rastro); rastro é (item, rastro anterior)
+    states = [(0, 0, 0, None)]
+    examined = 0
+    
+    for i, (weight, volume, value) in enumerate(items):
+        # Estados novos: cada estado atual com o item i (se couber)
+        candidates = list(states)
+        for w, v, val, trace in states:
+            if w + weight <= max_weight and v + volume <= max_volume:
+                candidates.append((w + weight, v + volume, val + value, (i, trace)))
+        
+        examined += len(candidates)
+        states = _pareto_filter(candidates)
+    
+    # Melhor estado final
+    max_value, trace = 0, None
+    for w, v, val, state_trace in states:
+        if val > max_value:
+            max_value, trace = val, state_trace
+    
+    # Rastreia pra encontrar os itens
+    selected = []
+    while trace is not None:
+        i, trace = trace
+        selected.append(i)
+    
+    selected.reverse()
+    
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+    
+    if stats is not None:
+        add_counts(stats, dp_cells=examined)
+        stats.setdefault("incumbents", []).append((execution_time, max_value))
+    
+    return max_value, selected, execution_time
+
+
+def _pareto_filter(states):
+    # Remove os estados dominados
+    # Ordena por peso e volume crescentes (valor decrescente no empate):
+    # um estado só pode ser dominado por um que vem antes dele. A árvore
+    # de Fenwick guarda o maior valor já visto por volume (prefixo), então
+    # cada teste "existe anterior com volume <= v e valor >= val" é O(log S)
+    states.sort(key=lambda s: (s[0], s[1], -s[2]))
+    
+    volumes = sorted({s[1] for s in states})
+    rank = {v: k + 1 for k, v in enumerate(volumes)}
+    size = len(volumes)
+    tree = [-1] * (size + 1)
+    
+    kept = []
+    for state in states:
+        val = state[2]
+        
+        # Maior valor entre os estados anteriores com volume <= v
+        k = rank[state[1]]
+        best = -1
+        while k > 0:
+            if tree[k] > best:
+                best = tree[k]
+            k -= k & -k
+        
+        if best >= val:
+            continue
+        
+        kept.append(state)
+        k = rank[state[1]]
+        while k <= size:
+            if tree[k] < val:
+                tree[k] = val
+            k += k & -k
+    
+    return kept
+
+
+def solve_approximate(max_weight, max_volume, items, epsilon=0.1):
+    # Versão aproximada: divide pesos e capacidades por um fator de escala
+    # e resolve a DP menor. Pesos arredondam pra cima e capacidades pra
+    # baixo, então a seleção sempre cabe na instância original
+    # Com s = floor(epsilon * W / n), cada item perde no máximo s - 1
+    # unidades de capacidade: a resposta é ótima pra capacidades
+    # (1 - epsilon) * W e (1 - epsilon) * V, e a tabela fica com
+    # ~(n / epsilon)^2 células por item no pior caso
+    # Com duas restrições isso sozinho não garante valor >= (1 - epsilon)
+    # * ótimo (o ótimo pode usar a capacidade toda); a garantia é conferida
+    # contra o bound do Branch and Bound (surrogate) e, se falhar, a escala
+    # cai pela metade e a DP roda de novo, até ficar exata (escala 1)
+    # Retorna (max_value, selected, execution_time, upper_bound), com
+    # upper_bound >= ótimo e max_value >= (1 - epsilon) * ótimo
+    # A DP usada é a de dynamic_programming_numpy (decisões em bits) se o
+    # NumPy estiver instalado
+    
+    start_time = time.perf_counter()
+    n = len(items)
+    
+    # Sem itens ou capacidade zero: nada cabe
+    if n == 0 or max_weight <= 0 or max_volume <= 0:
+        return 0, [], time.perf_counter() - start_time, 0
+    
+    # importado aqui: dynamic_programming_numpy importa este módulo
+    try:
+        from dynamic_programming_numpy import solve_low_memory as solve_exact
+    except ImportError:
+        solve_exact = solve_with_traceback_3d
+    
+    # Fatores de escala (1 = sem escala)
+    weight_scale = max(1, int(epsilon * max_weight / n))
+    volume_scale = max(1, int(epsilon * max_volume / n))
+    
+    # Sem escala a DP já é exata: a resposta é o ótimo
+    if weight_scale == 1 and volume_scale == 1:
+        max_value, selected, _ = solve_exact(max_weight, max_volume, items)
+        return max_value, selected, time.perf_counter() - start_time, max_value
+    
+    # Limite superior do ótimo: bound do B&B na raiz
+    _, _, bound_fn = setup_bound(
+        as_item_set(items), max_weight, max_volume, "surrogate"
+    )
+    upper_bound = math.floor(bound_fn(0, 0, 0, 0) + 1e-6)
+    order = greedy_orders(max_weight, max_volume, items)[0]
+    
+    while True:
+        scaled_items = [
+            (-(-weight // weight_scale), -(-volume // volume_scale), value)
+            for weight, volume, value in items
+        ]
+        _, selected, _ = solve_exact(
+            max_weight // weight_scale, max_volume // volume_scale, scaled_items
+        )
+        
+        # Capacidade perdida no arredondamento: completa com itens que cabem
+        chosen = [False] * n
+        for i in selected:
+            chosen[i] = True
+        greedy_fill(max_weight, max_volume, items, order, chosen)
+        
+        selected = [i for i in range(n) if chosen[i]]
+        max_value = sum(items[i][2] for i in selected)
+        
+        if weight_scale == 1 and volume_scale == 1:
+            # DP exata: a resposta é o ótimo
+            upper_bound = max_value
+            break
+        if max_value >= (1 - epsilon) * upper_bound:
+            break
+        
+        weight_scale = max(1, weight_scale // 2)
+        volume_scale = max(1, volume_scale // 2)
+    
+    upper_bound = max(max_value, upper_bound)
+    
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+    
+    return max_value, selected, execution_time, upper_bound
+
+
 def read_input(filename):
     # Lê o arquivo de entrada
     # Formato: primeira linha tem W e V
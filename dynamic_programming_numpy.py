@@ -0,0 +1,519 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import time
+import sys
+
+import numpy as np
+
+from dynamic_programming import write_output
+from instance_loader import load_items
+from solver_stats import add_counts
+
+# Tamanho alvo de um bloco de linhas de uma camada (int64) sem threads:
+# a camada anterior, a deslocada e a nova do bloco cabem juntas no cache L2
+TILE_BYTES = 1 << 18
+# Com threads, cada camada vira poucos blocos por thread (uma tarefa por
+# bloco, percorrido em pedaços de TILE_BYTES): uma tarefa por pedaço dava
+# milhares de futures por camada. Mais de um bloco por thread equilibra
+# a carga
+BLOCKS_PER_THREAD = 4
+# solve_batch só empilha um lote se, em média, pelo menos essa quantidade
+# de instâncias divide cada formato (peso, volume) de item: com formatos
+# quase todos distintos cada atualização cobre uma ou duas instâncias e o
+# lote fica mais lento que solve_vectorized em laço
+MIN_SHARED_SHAPES = 4
+
+
+def _apply_item(dp, take, weight, volume, value):
+    # Aplica um item na camada dp (no lugar) e marca em take as células
+    # onde incluir o item foi melhor
+    max_weight = dp.shape[0] - 1
+    max_volume = dp.shape[1] - 1
+
+    # Valor incluindo o item: célula (w - peso, v - volume) + valor
+    # A soma gera uma cópia, então dá pra atualizar dp no lugar
+    value_with = dp[:max_weight + 1 - weight, :max_volume + 1 - volume] + value
+    value_without = dp[weight:, volume:]
+
+    np.greater(value_with, value_without, out=take[weight:, volume:])
+    np.maximum(value_without, value_with, out=value_without)
+
+
+def _updated_cells(max_weight, max_volume, items):
+    # Células (w, v) tocadas pelos itens que cabem
+    return sum(
+        (max_weight + 1 - weight) * (max_volume + 1 - volume)
+        for weight, volume, _ in items
+        if weight <= max_weight and volume <= max_volume
+    )
+
+
+def solve_vectorized(max_weight, max_volume, items, stats=None):
+    # Mesma recorrência de solve_with_traceback_3d, mas a camada
+    # (W+1) x (V+1) inteira fica num array NumPy e cada item é aplicado
+    # com um único np.maximum sobre fatias deslocadas
+    # Complexidade: O(n * W * V) tempo (vetorizado), O(W * V) inteiros
+    # + O(n * W * V) bytes de decisões pra rastrear a solução
+    # Com stats, dp_cells conta as células que os itens que cabem atualizam
+
+    start_time = time.perf_counter()
+    n = len(items)
+
+    # dp[w][v] = valor máximo com peso <= w e volume <= v
+    dp = np.zeros((max_weight + 1, max_volume + 1), dtype=np.int64)
+
+    # take[i][w][v] = True se o item i melhorou a célula (w, v)
+    take = np.zeros((n, max_weight + 1, max_volume + 1), dtype=bool)
+
+    for i, (weight, volume, value) in enumerate(items):
+        # Item que não cabe nunca muda a tabela
+        if weight > max_weight or volume > max_volume:
+            continue
+
+        _apply_item(dp, take[i], weight, volume, value)
+
+    # Rastreia pra encontrar os itens
+    selected = []
+    w, v = max_weight, max_volume
+
+    for i in range(n - 1, -1, -1):
+        if take[i, w, v]:
+            selected.append(i)
+            w -= items[i][0]
+            v -= items[i][1]
+
+    selected.reverse()
+    max_value = int(dp[max_weight, max_volume])
+
+    execution_time = time.perf_counter() - start_time
+
+    if stats is not None:
+        add_counts(stats, dp_cells=_updated_cells(max_weight, max_volume, items))
+        stats.setdefault("incumbents", []).append((execution_time, max_value))
+
+    return max_value, selected, execution_time
+
+
+def solve_low_memory(max_weight, max_volume, items, stats=None):
+    # Igual a solve_vectorized, mas as decisões de cada item são guardadas
+    # como bits compactados (np.packbits), 1 bit por célula em vez de 1 byte
+    # Pico de memória: uma camada de int64 + um buffer de decisões
+    # + n * (W+1) * (V+1) / 8 bytes
+    # Complexidade: O(n * W * V) tempo, O(W * V + n * W * V / 8) espaço
+
+    start_time = time.perf_counter()
+    n = len(items)
+
+    dp = np.zeros((max_weight + 1, max_volume + 1), dtype=np.int64)
+
+    # Buffer de decisões reaproveitado entre os itens
+    take = np.zeros((max_weight + 1, max_volume + 1), dtype=bool)
+
+    # packed[i][w] = linha de bits do item i (None se o item não cabe)
+    packed = [None] * n
+
+    for i, (weight, volume, value) in enumerate(items):
+        if weight > max_weight or volume > max_volume:
+            continue
+
+        take.fill(False)
+        _apply_item(dp, take, weight, volume, value)
+        packed[i] = np.packbits(take, axis=1)
+
+    # Rastreia lendo o bit (w, v) de cada item; packbits é big-endian
+    selected = []
+    w, v = max_weight, max_volume
+
+    for i in range(n - 1, -1, -1):
+        bits = packed[i]
+        if bits is not None and (bits[w, v >> 3] >> (7 - (v & 7))) & 1:
+            selected.append(i)
+            w -= items[i][0]
+            v -= items[i][1]
+
+    selected.reverse()
+    max_value = int(dp[max_weight, max_volume])
+
+    execution_time = time.perf_counter() - start_time
+
+    if stats is not None:
+        add_counts(stats, dp_cells=_updated_cells(max_weight, max_volume, items))
+        stats.setdefault("incumbents", []).append((execution_time, max_value))
+
+    return max_value, selected, execution_time
+
+
+def _check_threads(threads):
+    # Número de threads validado (None: um por núcleo)
+    if threads is None:
+        return os.cpu_count() or 1
+    if threads < 1:
+        raise ValueError(f"threads precisa ser pelo menos 1 (recebido {threads})")
+    return threads
+
+
+def _tile_rows(max_volume, tile_rows=None):
+    # Linhas de peso por pedaço (tile_rows explícito ou pelo TILE_BYTES)
+    if tile_rows is not None:
+        if tile_rows < 1:
+            raise ValueError(f"tile_rows precisa ser pelo menos 1 (recebido {tile_rows})")
+        return tile_rows
+    return max(1, TILE_BYTES // (8 * (max_volume + 1)))
+
+
+def _update_tile(prev, layer, packed, start, stop, weight, volume, value):
+    # Calcula as linhas [start, stop) da camada nova (layer) a partir da
+    # anterior (prev) e grava em packed[start:stop] as decisões do item
+    # em bits. Só lê prev e só escreve nas próprias linhas, então blocos
+    # diferentes podem rodar em qualquer ordem (ou ao mesmo tempo)
+    max_volume = prev.shape[1] - 1
+
+    layer[start:stop] = prev[start:stop]
+    take = np.zeros((stop - start, max_volume + 1), dtype=bool)
+
+    # Linhas onde o item cabe no peso
+    first = max(start, weight)
+    if first < stop and volume <= max_volume:
+        value_with = prev[first - weight:stop - weight, :max_volume + 1 - volume] + value
+        value_without = layer[first:stop, volume:]
+
+        np.greater(value_with, value_without, out=take[first - start:, volume:])
+        np.maximum(value_without, value_with, out=value_without)
+
+    packed[start:stop] = np.packbits(take, axis=1)
+
+
+def _solve_tiled(max_weight, max_volume, items, prev, layer, packed, tile_rows,
+                 pool=None, threads=1):
+    # Preenche a DP camada a camada, em pedaços de tile_rows linhas de
+    # peso, alternando os buffers prev/layer. packed[i] recebe as decisões
+    # do item i (itens que não cabem ficam sem decisões)
+    # Com pool (ThreadPoolExecutor de threads threads), cada camada é
+    # dividida em BLOCKS_PER_THREAD blocos por thread, que rodam em
+    # paralelo (os kernels do NumPy soltam o GIL), cada um percorrendo
+    # seus pedaços; a troca de buffers só acontece depois que todos os
+    # blocos do item terminam
+    # Retorna (max_value, selected); nenhuma camada sai daqui (com memmap,
+    # uma referência viva deixaria o arquivo mapeado e o Windows não
+    # apagaria a pasta temporária)
+    n = len(items)
+    fits = [False] * n
+
+    # blocos = grupos de pedaços consecutivos
+    tiles = [
+        (start, min(start + tile_rows, max_weight + 1))
+        for start in range(0, max_weight + 1, tile_rows)
+    ]
+    n_blocks = min(len(tiles), threads * BLOCKS_PER_THREAD) if pool else 1
+    per_block = -(-len(tiles) // n_blocks)
+    blocks = [tiles[k:k + per_block] for k in range(0, len(tiles), per_block)]
+
+    for i, (weight, volume, value) in enumerate(items):
+        # Item que não cabe nunca muda a tabela
+        if weight > max_weight or volume > max_volume:
+            continue
+
+        fits[i] = True
+
+        def update(block):
+            for start, stop in block:
+                _update_tile(prev, layer, packed[i], start, stop, weight, volume, value)
+
+        if pool is None:
+            update(tiles)
+        else:
+            # list() espera todos os blocos (e repassa exceções)
+            list(pool.map(update, blocks))
+
+        prev, layer = layer, prev
+
+    # Rastreia lendo o bit (w, v) de cada item; packbits é big-endian
+    selected = []
+    w, v = max_weight, max_volume
+
+    for i in range(n - 1, -1, -1):
+        if fits[i] and (packed[i, w, v >> 3] >> (7 - (v & 7))) & 1:
+            selected.append(i)
+            w -= items[i][0]
+            v -= items[i][1]
+
+    selected.reverse()
+    return int(prev[max_weight, max_volume]), selected
+
+
+def solve_threaded(max_weight, max_volume, items, threads=None,
+                   tile_rows=None, stats=None):
+    # DP em memória com as linhas de peso de cada camada divididas em
+    # BLOCKS_PER_THREAD blocos por thread, processados por threads threads
+    # (padrão: os.cpu_count()).
+    # Cada item lê a camada anterior e escreve na outra (buffer duplo),
+    # então os blocos não dependem uns dos outros
+    # Decisões em bits como em solve_low_memory
+    # Complexidade: O(n * W * V / threads) tempo, O(W * V + n * W * V / 8)
+    # espaço (duas camadas de inteiros + n * (W+1) * (V+1) / 8 bytes de
+    # decisões)
+
+    start_time = time.perf_counter()
+    threads = _check_threads(threads)
+    rows = _tile_rows(max_volume, tile_rows)
+    n = len(items)
+
+    prev = np.zeros((max_weight + 1, max_volume + 1), dtype=np.int64)
+    layer = np.empty_like(prev)
+    packed = np.zeros((n, max_weight + 1, (max_volume + 1 + 7) // 8), dtype=np.uint8)
+
+    # uma thread só: sem pool, os blocos rodam direto nesta thread
+    pool = ThreadPoolExecutor(threads) if threads > 1 else None
+    try:
+        max_value, selected = _solve_tiled(
+            max_weight, max_volume, items, prev, layer, packed, rows,
+            pool, threads
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    execution_time = time.perf_counter() - start_time
+
+    if stats is not None:
+        add_counts(stats, dp_cells=_updated_cells(max_weight, max_volume, items))
+        stats.setdefault("incumbents", []).append((execution_time, max_value))
+
+    return max_value, selected, execution_time
+
+
+def solve_out_of_core(max_weight, max_volume, items, directory=None,
+                      tile_rows=None, threads=1, stats=None):
+    # DP fora da memória: as duas camadas (anterior e nova) ficam em
+    # arquivos mapeados (numpy.memmap) e são percorridas em blocos de
+    # linhas de peso; as decisões de cada item vão em bits pra um terceiro
+    # arquivo, lido no rastreamento. Em RAM fica só um bloco por vez (o
+    # sistema operacional pagina o resto)
+    # Disco: 2 * (W+1) * (V+1) * 8 bytes + n * (W+1) * (V+1) / 8 bytes, numa
+    # pasta temporária dentro de directory (padrão: a do sistema),
+    # apagada no fim. threads > 1 divide os blocos entre threads como em
+    # solve_threaded (em RAM fica um pedaço por thread)
+    # Complexidade: O(n * W * V) tempo, O(tile_rows * V) memória
+
+    start_time = time.perf_counter()
+    threads = _check_threads(threads)
+    rows = _tile_rows(max_volume, tile_rows)
+    n = len(items)
+    shape = (max_weight + 1, max_volume + 1)
+    # memmap não aceita arquivo vazio: reserva pelo menos um item
+    packed_shape = (max(n, 1), max_weight + 1, (max_volume + 1 + 7) // 8)
+
+    with tempfile.TemporaryDirectory(prefix="mochila_dp_", dir=directory) as folder:
+        prev = np.memmap(os.path.join(folder, "camada_a.bin"), dtype=np.int64,
+                         mode="w+", shape=shape)
+        layer = np.memmap(os.path.join(folder, "camada_b.bin"), dtype=np.int64,
+                          mode="w+", shape=shape)
+        packed = np.memmap(os.path.join(folder, "decisoes.bin"), dtype=np.uint8,
+                           mode="w+", shape=packed_shape)
+
+        # memmap novo já vem zerado: é a camada sem itens
+        pool = ThreadPoolExecutor(threads) if threads > 1 else None
+        try:
+            max_value, selected = _solve_tiled(
+                max_weight, max_volume, items, prev, layer, packed, rows,
+                pool, threads
+            )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        # solta os mapeamentos antes de apagar os arquivos
+        del prev, layer, packed
+
+    execution_time = time.perf_counter() - start_time
+
+    if stats is not None:
+        add_counts(stats, dp_cells=_updated_cells(max_weight, max_volume, items))
+        stats.setdefault("incumbents", []).append((execution_time, max_value))
+
+    return max_value, selected, execution_time
+
+
+def _solve_stack(max_weight, max_volume, item_lists):
+    # Resolve várias instâncias com o mesmo (W, V) de uma vez: a camada é
+    # um array (B, W+1, V+1) e o i-ésimo item de todas as instâncias é
+    # aplicado junto (uma operação por formato de item distinto).
+    # Instâncias com menos itens recebem itens (0, 0, 0), que nunca mudam
+    # a tabela
+    # Retorna [(max_value, selected)] na ordem de item_lists
+
+    batch = len(item_lists)
+    n = max(len(items) for items in item_lists)
+
+    # table[b][i] = (peso, volume, valor) do item i da instância b
+    table = np.zeros((batch, n, 3), dtype=np.int64)
+    for b, items in enumerate(item_lists):
+        if items:
+            table[b, :len(items)] = items
+
+    dp = np.zeros((batch, max_weight + 1, max_volume + 1), dtype=np.int64)
+    take = np.zeros((n, batch, max_weight + 1, max_volume + 1), dtype=bool)
+
+    for i in range(n):
+        # Instâncias cujo item i tem o mesmo (peso, volume) usam o mesmo
+        # deslocamento, então cada grupo é atualizado com fatias
+        shapes, group, counts = np.unique(
+            table[:, i, :2], axis=0, return_inverse=True, return_counts=True
+        )
+        members = np.split(
+            np.argsort(group.reshape(-1), kind="stable"), np.cumsum(counts)[:-1]
+        )
+
+        for (weight, volume), rows in zip(shapes.tolist(), members):
+            # Item que não cabe nunca muda a tabela
+            if weight > max_weight or volume > max_volume:
+                continue
+
+            # Linhas contíguas (instâncias ordenadas por formato em
+            # solve_batch): fatia, atualizada no lugar sem copiar a pilha
+            contiguous = rows[-1] - rows[0] + 1 == len(rows)
+            if contiguous:
+                rows = slice(rows[0], rows[-1] + 1)
+            layer = dp[rows]
+            value = table[rows, i, 2][:, None, None]
+
+            value_with = layer[:, :max_weight + 1 - weight, :max_volume + 1 - volume] + value
+            value_without = layer[:, weight:, volume:]
+
+            take[i, rows, weight:, volume:] = value_with > value_without
+            np.maximum(value_without, value_with, out=value_without)
+            if not contiguous:
+                dp[rows] = layer
+
+    # Rastreia cada instância
+    results = []
+    for b, items in enumerate(item_lists):
+        selected = []
+        w, v = max_weight, max_volume
+
+        for i in range(len(items) - 1, -1, -1):
+            if take[i, b, w, v]:
+                selected.append(i)
+                w -= items[i][0]
+                v -= items[i][1]
+
+        selected.reverse()
+        results.append((int(dp[b, max_weight, max_volume]), selected))
+
+    return results
+
+
+def _shared_shapes(item_lists):
+    # Média de instâncias por formato (peso, volume) distinto em cada
+    # posição de item
+
+    shapes = set()
+    total = 0
+    for items in item_lists:
+        for i, item in enumerate(items):
+            shapes.add((i, item[0], item[1]))
+        total += len(items)
+
+    return total / max(len(shapes), 1)
+
+
+def solve_batch(instances, max_cells=50_000_000):
+    # Resolve uma lista de instâncias em memória [(W, V, items), ...]
+    # Agrupa por (W, V) e resolve cada grupo com _solve_stack, em lotes
+    # de até max_cells células de decisão (itens x instâncias x W x V)
+    # Retorna [(max_value, selected, execution_time)] na ordem de entrada;
+    # execution_time é o tempo do lote dividido pelo número de instâncias
+    # O ganho vem das instâncias que dividem formatos de item (mesmo peso e
+    # volume na mesma posição); lotes sem isso (ver MIN_SHARED_SHAPES) são
+    # resolvidos uma instância por vez com solve_vectorized
+
+    results = [None] * len(instances)
+
+    groups = {}
+    for k, (max_weight, max_volume, _) in enumerate(instances):
+        groups.setdefault((max_weight, max_volume), []).append(k)
+
+    for (max_weight, max_volume), members in groups.items():
+        # Ordena pelos formatos (peso, volume) dos itens: instâncias com os
+        # mesmos formatos ficam juntas no lote e cada formato vira uma fatia
+        members.sort(key=lambda k: [(item[0], item[1]) for item in instances[k][2]])
+        n = max(len(instances[k][2]) for k in members)
+        cells = max(n, 1) * (max_weight + 1) * (max_volume + 1)
+        chunk = max(1, max_cells // cells)
+
+        for start in range(0, len(members), chunk):
+            part = members[start:start + chunk]
+
+            if _shared_shapes([instances[k][2] for k in part]) < MIN_SHARED_SHAPES:
+                for k in part:
+                    results[k] = solve_vectorized(*instances[k])
+                continue
+
+            start_time = time.perf_counter()
+            solved = _solve_stack(
+                max_weight, max_volume, [instances[k][2] for k in part]
+            )
+            execution_time = (time.perf_counter() - start_time) / len(part)
+
+            for k, (max_value, selected) in zip(part, solved):
+                results[k] = (max_value, selected, execution_time)
+
+    return results
+
+
+def main():
+    # Programa principal (mesma interface de dynamic_programming.py)
+
+    # --disco: DP fora da memória (solve_out_of_core)
+    # --threads=N: blocos da camada em N threads (N >= 1)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    out_of_core = "--disco" in sys.argv[1:]
+    threads = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--threads="):
+            text = arg.split("=", 1)[1]
+            if not text.isdigit() or int(text) < 1:
+                print(f"--threads precisa ser um inteiro >= 1 (recebido '{text}')")
+                sys.exit(1)
+            threads = int(text)
+
+    if not args:
+        print("Uso: python dynamic_programming_numpy.py <arquivo_entrada> [arquivo_saída] "
+              "[--disco] [--threads=N]")
+        sys.exit(1)
+
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else "output_dp.txt"
+
+    max_weight, max_volume, items = load_items(input_file)
+
+    print(f"Peso máximo: {max_weight}")
+    print(f"Volume máximo: {max_volume}")
+    print(f"Quantidade de itens: {len(items)}")
+    print()
+
+    if out_of_core:
+        max_value, selected_items, execution_time = solve_out_of_core(
+            max_weight, max_volume, items, threads=threads or 1
+        )
+    elif threads is not None:
+        max_value, selected_items, execution_time = solve_threaded(
+            max_weight, max_volume, items, threads
+        )
+    else:
+        max_value, selected_items, execution_time = solve_vectorized(
+            max_weight, max_volume, items
+        )
+
+    print(f"Lucro Máximo: {max_value}")
+    print(f"Itens Selecionados: {selected_items}")
+    print(f"Tempo de Execução: {execution_time:.6f} segundos")
+    print()
+
+    write_output(output_file, max_value, selected_items, execution_time, items)
+    print(f"Resultado salvo em: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,182 @@
-import random
+import argparse
+import hashlib
 import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Famílias clássicas de instâncias difíceis (Pisinger), com peso e volume
+# sorteados em [1, R] e o "tamanho" do item s = (peso + volume) / 2
+FAMILIES = (
+    "sem_correlacao",      # valor em [1, R]
+    "fraca",               # valor em [s - R/10, s + R/10]
+    "forte",               # valor = s + R/10
+    "inversa_forte",       # valor em [1, R], peso e volume ~ valor + R/10
+    "soma_subconjuntos",   # valor = s
+)
+
+# Capacidade como fração da soma de pesos (e de volumes) dos itens
+CAPACITIES = {
+    "apertada": 0.1,
+    "media": 0.3,
+    "folgada": 0.6,
+}
+
+# Itens gerados e escritos por vez
+CHUNK_SIZE = 1 << 16
 
 
 def generate_instance(n_items, max_weight, max_volume, seed=None):
-    # Gera uma instância aleatória
-    
-    if seed is not None:
-        random.seed(seed)
-    
+    # Gera uma instância aleatória (itens sem correlação, capacidades fixas)
+
+    rng = random.Random(seed) if seed is not None else random
+
     # Primeira linha com capacidades
-    instance = f"{max_weight} {max_volume}\n"
-    
+    lines = [f"{max_weight} {max_volume}\n"]
+
     # Gera itens aleatórios
     for _ in range(n_items):
-        weight = random.randint(1, max_weight // 3)
-        volume = random.randint(1, max_volume // 3)
-        value = random.randint(weight + volume, (weight + volume) * 3)
-        instance += f"{weight}\t{volume}\t{value}\n"
-    
-    return instance
+        weight = rng.randint(1, max_weight // 3)
+        volume = rng.randint(1, max_volume // 3)
+        value = rng.randint(weight + volume, (weight + volume) * 3)
+        lines.append(f"{weight}\t{volume}\t{value}\n")
+
+    return "".join(lines)
+
+
+def _family_chunk(rng, family, size, value_range):
+    # Sorteia size itens da família, como array (size, 3) de int64
+    r = value_range
+
+    if family == "inversa_forte":
+        values = rng.integers(1, r + 1, size)
+        weights = values + r // 10
+        volumes = np.maximum(
+            1, values + r // 10 + rng.integers(-(r // 20), r // 20 + 1, size)
+        )
+        return np.column_stack((weights, volumes, values))
+
+    weights = rng.integers(1, r + 1, size)
+    volumes = rng.integers(1, r + 1, size)
+    item_size = (weights + volumes) // 2
+
+    if family == "sem_correlacao":
+        values = rng.integers(1, r + 1, size)
+    elif family == "fraca":
+        values = np.maximum(
+            1, item_size + rng.integers(-(r // 10), r // 10 + 1, size)
+        )
+    elif family == "forte":
+        values = item_size + r // 10
+    elif family == "soma_subconjuntos":
+        values = item_size
+    else:
+        raise ValueError(f"Família desconhecida: {family}")
+
+    return np.column_stack((weights, volumes, values))
+
+
+def item_chunks(family, n_items, seed, value_range=1000, chunk_size=CHUNK_SIZE):
+    # Gera os itens em blocos de até chunk_size linhas (mesma semente =
+    # mesmos blocos, então dá pra percorrer a instância duas vezes)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_items, chunk_size):
+        yield _family_chunk(
+            rng, family, min(chunk_size, n_items - start), value_range
+        )
+
+
+def generate_items(family, n_items, seed, value_range=1000):
+    # Instância inteira em memória: array (n, 3) com peso, volume, valor
+    chunks = list(item_chunks(family, n_items, seed, value_range))
+    if not chunks:
+        return np.empty((0, 3), dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def capacities_for(items, capacity="media"):
+    # (W, V) como fração CAPACITIES[capacity] das somas de peso e volume
+    ratio = CAPACITIES[capacity]
+    return (
+        max(1, int(ratio * int(items[:, 0].sum()))),
+        max(1, int(ratio * int(items[:, 1].sum()))),
+    )
+
+
+def write_instance(path, family, n_items, seed, value_range=1000,
+                   capacity="media", max_weight=None, max_volume=None):
+    """
+    Escreve uma instância da família direto no arquivo, bloco a bloco,
+    sem montar o texto inteiro em memória (serve pra milhões de itens).
+
+    Sem max_weight/max_volume, as capacidades saem de capacity (fração da
+    soma dos pesos e volumes): os itens são gerados uma vez só pra somar
+    e de novo, com a mesma semente, pra escrever.
+    Retorna (W, V).
+    """
+    if max_weight is None or max_volume is None:
+        total_weight = total_volume = 0
+        for chunk in item_chunks(family, n_items, seed, value_range):
+            total_weight += int(chunk[:, 0].sum())
+            total_volume += int(chunk[:, 1].sum())
+
+        ratio = CAPACITIES[capacity]
+        if max_weight is None:
+            max_weight = max(1, int(ratio * total_weight))
+        if max_volume is None:
+            max_volume = max(1, int(ratio * total_volume))
+
+    # Escreve num temporário e renomeia: arquivo pela metade nunca fica
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(f"{max_weight} {max_volume}\n")
+        for chunk in item_chunks(family, n_items, seed, value_range):
+            f.write(("%d\t%d\t%d\n" * len(chunk)) % tuple(chunk.ravel().tolist()))
+    os.replace(tmp, path)
+
+    return max_weight, max_volume
+
+
+def instance_seed(name, base_seed=0):
+    # Semente estável a partir do nome: não depende da ordem de execução
+    digest = hashlib.sha256(f"{base_seed}:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _write_task(task):
+    path, family, n_items, seed, value_range, capacity = task
+    write_instance(path, family, n_items, seed, value_range, capacity)
+    return path
+
+
+def generate_suite(out_dir, families=FAMILIES, sizes=(100, 1000),
+                   count=10, capacities=("media",), value_range=1000,
+                   jobs=None, base_seed=0):
+    """
+    Gera count instâncias pra cada (família, capacidade, n) em out_dir,
+    com os arquivos escritos em paralelo por jobs processos.
+    Nome: <família>_<capacidade>_<n>_<i>.txt (categoria do benchmark =
+    tudo antes do último "_").
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = []
+    for family in families:
+        for capacity in capacities:
+            for n_items in sizes:
+                for i in range(count):
+                    name = f"{family}_{capacity}_{n_items}_{i + 1}.txt"
+                    tasks.append((
+                        os.path.join(out_dir, name), family, n_items,
+                        instance_seed(name, base_seed), value_range, capacity
+                    ))
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for path in pool.map(_write_task, tasks):
+            print(f"  ✓ Criado: {path}")
+
+    print(f"\n{len(tasks)} instâncias geradas em {out_dir}")
 
 
 def create_test_instances():
@@ -52,5 +210,43 @@ def create_test_instances():
     print("\nTodas as instâncias foram geradas!")
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="Gera instâncias da mochila 0-1 com peso e volume"
+    )
+    parser.add_argument(
+        "--suite", action="store_true",
+        help="gera a suíte de famílias difíceis (sem isso, as 80 instâncias "
+             "de instancias/)"
+    )
+    parser.add_argument("--out", default="instancias_grandes", help="pasta de saída da suíte")
+    parser.add_argument(
+        "--families", nargs="+", default=list(FAMILIES), choices=FAMILIES,
+        help="famílias de correlação"
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[100, 1000],
+        help="números de itens"
+    )
+    parser.add_argument("--count", type=int, default=10, help="instâncias por configuração")
+    parser.add_argument(
+        "--capacities", nargs="+", default=["media"], choices=list(CAPACITIES),
+        help="capacidade como fração da soma de pesos/volumes"
+    )
+    parser.add_argument("--range", type=int, default=1000, help="R: pesos e volumes em [1, R]")
+    parser.add_argument("--seed", type=int, default=0, help="semente base da suíte")
+    parser.add_argument("--jobs", type=int, default=None, help="processos em paralelo")
+    args = parser.parse_args()
+
+    if not args.suite:
+        create_test_instances()
+        return
+
+    generate_suite(
+        args.out, args.families, args.sizes, args.count, args.capacities,
+        args.range, args.jobs, args.seed
+    )
+
+
 if __name__ == "__main__":
-    create_test_instances()
+    main()
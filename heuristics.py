@@ -0,0 +1,146 @@
+# heuristics.py
+# Heurísticas rápidas pra mochila 0-1 com peso e volume: gulosos com várias
+# densidades seguidos de busca local (adição, troca 1-1 e troca 1-2).
+# A solução serve de incumbente inicial pros solvers exatos, que assim
+# podam desde o primeiro nó.
+
+
+def greedy_orders(max_weight, max_volume, items):
+    # Ordens gulosas (índices) por várias densidades, da melhor pra pior
+    # items: lista de (peso, volume, valor)
+    scale_weight = max(max_weight, 1)
+    scale_volume = max(max_volume, 1)
+
+    keys = (
+        # capacidade normalizada: peso e volume contam igual
+        lambda i: items[i][2] / (
+            items[i][0] / scale_weight + items[i][1] / scale_volume
+        ),
+        # a mesma densidade do backtracking
+        lambda i: items[i][2] / (items[i][0] + items[i][1]),
+        lambda i: items[i][2] / max(items[i][0], 1e-9),
+        lambda i: items[i][2] / max(items[i][1], 1e-9),
+        lambda i: items[i][2],
+    )
+
+    indices = range(len(items))
+    return [sorted(indices, key=key, reverse=True) for key in keys]
+
+
+def greedy_fill(max_weight, max_volume, items, order, chosen):
+    # Coloca na mochila, na ordem dada, todo item que ainda cabe
+    # chosen (lista de bool) é atualizada no lugar
+    w = v = 0
+    for i, is_chosen in enumerate(chosen):
+        if is_chosen:
+            w += items[i][0]
+            v += items[i][1]
+
+    for i in order:
+        weight, volume, _ = items[i]
+        if not chosen[i] and w + weight <= max_weight and v + volume <= max_volume:
+            chosen[i] = True
+            w += weight
+            v += volume
+
+    return chosen
+
+
+def greedy_solution(max_weight, max_volume, items):
+    # Melhor entre os gulosos de greedy_orders
+    # Retorna (valor, selecionados, ordem que gerou a solução)
+    best_value, best_chosen, best_order = -1, None, None
+
+    for order in greedy_orders(max_weight, max_volume, items):
+        chosen = greedy_fill(max_weight, max_volume, items, order, [False] * len(items))
+        value = sum(items[i][2] for i, is_chosen in enumerate(chosen) if is_chosen)
+        if value > best_value:
+            best_value, best_chosen, best_order = value, chosen, order
+
+    selected = [i for i, is_chosen in enumerate(best_chosen) if is_chosen]
+    return best_value, selected, best_order
+
+
+def local_search(max_weight, max_volume, items, selected, order=None,
+                 pool_size=32, max_passes=50):
+    """
+    Melhora uma solução viável por busca local. A cada passada completa a
+    solução com os itens que ainda cabem e aplica a melhor troca entre:
+
+    - 1-1: tira um item selecionado e põe um de fora
+    - 1-2: tira um item e põe dois de fora (os dois vêm dos pool_size
+      primeiros itens de fora em order, pra passada continuar O(n * k^2))
+
+    Para quando nenhuma troca melhora ou após max_passes passadas.
+    Retorna (valor, selecionados).
+    """
+    n = len(items)
+    if order is None:
+        order = greedy_orders(max_weight, max_volume, items)[0]
+
+    chosen = [False] * n
+    for i in selected:
+        chosen[i] = True
+
+    for _ in range(max_passes):
+        greedy_fill(max_weight, max_volume, items, order, chosen)
+
+        inside = [i for i in range(n) if chosen[i]]
+        outside = [i for i in order if not chosen[i]]
+        w = sum(items[i][0] for i in inside)
+        v = sum(items[i][1] for i in inside)
+
+        best_gain = 0
+        best_move = None
+
+        for i in inside:
+            weight_i, volume_i, value_i = items[i]
+            free_weight = max_weight - w + weight_i
+            free_volume = max_volume - v + volume_i
+
+            # troca 1-1
+            for j in outside:
+                weight_j, volume_j, value_j = items[j]
+                if value_j - value_i > best_gain and \
+                   weight_j <= free_weight and volume_j <= free_volume:
+                    best_gain = value_j - value_i
+                    best_move = (i, (j,))
+
+            # troca 1-2
+            pool = outside[:pool_size]
+            for a in range(len(pool)):
+                weight_a, volume_a, value_a = items[pool[a]]
+                if weight_a > free_weight or volume_a > free_volume:
+                    continue
+                for b in range(a + 1, len(pool)):
+                    weight_b, volume_b, value_b = items[pool[b]]
+                    gain = value_a + value_b - value_i
+                    if gain > best_gain and \
+                       weight_a + weight_b <= free_weight and \
+                       volume_a + volume_b <= free_volume:
+                        best_gain = gain
+                        best_move = (i, (pool[a], pool[b]))
+
+        if best_move is None:
+            break
+
+        removed, added = best_move
+        chosen[removed] = False
+        for j in added:
+            chosen[j] = True
+
+    selected = [i for i in range(n) if chosen[i]]
+    return sum(items[i][2] for i in selected), selected
+
+
+def heuristic_solution(max_weight, max_volume, items):
+    """
+    Solução viável rápida: melhor guloso multi-densidade + busca local.
+    items: lista de (peso, volume, valor)
+    Retorna (valor, selecionados) com os índices de items.
+    """
+    if not items:
+        return 0, []
+
+    _, selected, order = greedy_solution(max_weight, max_volume, items)
+    return local_search(max_weight, max_volume, items, selected, order)
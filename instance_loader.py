@@ -0,0 +1,130 @@
+# instance_loader.py
+# Leitor único das instâncias (primeira linha "W V", depois "peso volume
+# valor" por item). O texto é convertido uma vez e guardado num .npy ao
+# lado (pasta .cache), que nas próximas leituras é só mapeado em memória.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from item_set import ItemSet
+
+CACHE_DIR = ".cache"
+
+
+def parse_instance(data):
+    # Converte o conteúdo (bytes) do arquivo de uma vez só
+    # Retorna (W, V, items) com items um array int64 de forma (n, 3)
+    numbers = np.array(data.split(), dtype=np.int64)
+
+    if len(numbers) < 2 or (len(numbers) - 2) % 3 != 0:
+        raise ValueError("Formato inválido: esperado 'W V' e itens 'peso volume valor'")
+
+    max_weight, max_volume = int(numbers[0]), int(numbers[1])
+    items = numbers[2:].reshape(-1, 3)
+
+    return max_weight, max_volume, items
+
+
+def _cache_paths(filepath):
+    # .npy e metadados ficam em <pasta da instância>/.cache/
+    folder, name = os.path.split(os.path.abspath(filepath))
+    base = os.path.join(folder, CACHE_DIR, name)
+    return base + ".npy", base + ".json"
+
+
+def _write_atomic(path, write):
+    # Escreve num temporário e renomeia, pra leitores concorrentes nunca
+    # verem um arquivo pela metade
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _save_npy(path, table):
+    with open(path, "wb") as f:
+        np.save(f, table)
+
+
+def _save_json(path, meta):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def load_instance(filepath, use_cache=True):
+    """
+    Lê uma instância e retorna (W, V, items), items como array int64
+    (n, 3) com colunas peso, volume, valor.
+
+    Com use_cache, o array fica num .npy chaveado por mtime/tamanho do
+    arquivo e pelo SHA-1 do conteúdo: se mtime e tamanho batem, o .npy
+    é só mapeado (mmap, somente leitura); se o arquivo foi tocado mas o
+    conteúdo é o mesmo, só os metadados são atualizados.
+    """
+    if not use_cache:
+        with open(filepath, "rb") as f:
+            return parse_instance(f.read())
+
+    npy_path, meta_path = _cache_paths(filepath)
+    st = os.stat(filepath)
+
+    meta = None
+    if os.path.exists(meta_path) and os.path.exists(npy_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+
+    fresh = (
+        meta is not None
+        and meta["mtime_ns"] == st.st_mtime_ns
+        and meta["size"] == st.st_size
+    )
+
+    if not fresh:
+        with open(filepath, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+
+        if meta is None or meta["sha1"] != digest:
+            max_weight, max_volume, items = parse_instance(data)
+
+            # linha 0 = cabeçalho (W, V, n), depois os itens
+            table = np.empty((len(items) + 1, 3), dtype=np.int64)
+            table[0] = (max_weight, max_volume, len(items))
+            table[1:] = items
+
+            os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+            _write_atomic(npy_path, lambda tmp: _save_npy(tmp, table))
+
+        meta = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": digest}
+        _write_atomic(meta_path, lambda tmp: _save_json(tmp, meta))
+
+    table = np.load(npy_path, mmap_mode="r")
+    return int(table[0, 0]), int(table[0, 1]), table[1:]
+
+
+def load_items(filepath, use_cache=True):
+    # Mesmo retorno de dynamic_programming.read_input: (W, V, [(w, v, val)])
+    max_weight, max_volume, items = load_instance(filepath, use_cache)
+    return max_weight, max_volume, [tuple(row) for row in items.tolist()]
+
+
+def load_item_set(filepath, use_cache=True):
+    # (W, V, ItemSet) de uma instância: o ItemSet aponta direto pro array
+    # mapeado do cache (sem montar listas)
+    max_weight, max_volume, table = load_instance(filepath, use_cache)
+    return max_weight, max_volume, ItemSet.from_array(table)
+
+
+def load_directory(directory, use_cache=True):
+    # Carrega todas as instâncias .txt de uma pasta: {caminho: (W, V, items)}
+    instances = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".txt"):
+            filepath = os.path.join(directory, filename)
+            instances[filepath] = load_instance(filepath, use_cache)
+    return instances
@@ -0,0 +1,139 @@
+# item_set.py
+# Representação única dos itens pros três solvers: uma coluna por atributo
+# (peso, volume, valor) em vez de uma tupla ou objeto por item.
+# As colunas são memoryviews de inteiros de 64 bits, então um ItemSet pode
+# apontar pra um array.array, um array NumPy ou o .npy mapeado pelo
+# instance_loader sem copiar nada; fatias também não copiam.
+# Também se comporta como a lista de (peso, volume, valor) que a DP, as
+# heurísticas e o pré-processamento recebem.
+
+from array import array
+
+
+def _column(data):
+    # Coluna de inteiros de 64 bits como memoryview (sem cópia se data já
+    # expõe um buffer assim, como array('q') ou int64 do NumPy)
+    if isinstance(data, memoryview):
+        view = data
+    elif isinstance(data, array) and data.typecode == "q":
+        view = memoryview(data)
+    elif hasattr(data, "__array_interface__"):
+        # array NumPy (pode ser uma coluna com passo, ou um mmap só leitura)
+        view = memoryview(data if data.dtype.itemsize == 8 and data.dtype.kind == "i"
+                          else data.astype("int64"))
+    else:
+        view = memoryview(array("q", data))
+
+    if view.ndim != 1 or view.itemsize != 8 or view.format not in ("q", "l"):
+        raise ValueError("Coluna precisa ser unidimensional de inteiros de 64 bits")
+    return view
+
+
+class ItemSet:
+    """
+    Itens da mochila em colunas: weights, volumes e values (memoryviews).
+
+    items[i] devolve a tupla (peso, volume, valor) e iterar percorre as
+    tuplas, então um ItemSet entra onde a lista de tuplas entrava.
+    items[a:b] é outro ItemSet sobre as mesmas colunas (sem cópia).
+
+    ratios (valor / (peso + volume), a densidade do B&B e do backtracking)
+    e ratio_order (índices por ratio decrescente, empates na ordem de
+    entrada) são calculados na primeira consulta e guardados.
+    """
+
+    __slots__ = ("weights", "volumes", "values", "_ratios", "_ratio_order")
+
+    def __init__(self, weights, volumes, values):
+        self.weights = _column(weights)
+        self.volumes = _column(volumes)
+        self.values = _column(values)
+
+        if not (len(self.weights) == len(self.volumes) == len(self.values)):
+            raise ValueError("weights, volumes e values precisam ter o mesmo tamanho")
+
+        self._ratios = None
+        self._ratio_order = None
+
+    @classmethod
+    def from_tuples(cls, items):
+        # A partir da lista de (peso, volume, valor) de read_input
+        if not items:
+            return cls((), (), ())
+        weights, volumes, values = zip(*items)
+        return cls(weights, volumes, values)
+
+    @classmethod
+    def from_array(cls, table):
+        # A partir do array (n, 3) de instance_loader.load_instance: as
+        # colunas apontam pro próprio array (sem cópia)
+        return cls(table[:, 0], table[:, 1], table[:, 2])
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ItemSet(
+                self.weights[index], self.volumes[index], self.values[index]
+            )
+        return self.weights[index], self.volumes[index], self.values[index]
+
+    def take(self, indices):
+        # Novo ItemSet com as linhas em indices, nessa ordem (copia as colunas)
+        weights, volumes, values = self.weights, self.volumes, self.values
+        return ItemSet(
+            array("q", [weights[i] for i in indices]),
+            array("q", [volumes[i] for i in indices]),
+            array("q", [values[i] for i in indices]),
+        )
+
+    def __iter__(self):
+        return zip(self.weights, self.volumes, self.values)
+
+    def __reduce__(self):
+        # memoryview não é serializável: copia as colunas pra array('q')
+        return ItemSet, (
+            array("q", self.weights), array("q", self.volumes), array("q", self.values)
+        )
+
+    def __array__(self, dtype=None, copy=None):
+        # np.asarray(items): matriz (n, 3) como a de load_instance
+        import numpy as np
+        return np.column_stack(self.columns()).astype(dtype or np.int64, copy=False)
+
+    def columns(self):
+        # (pesos, volumes, valores) como arrays NumPy sobre as colunas (sem cópia)
+        import numpy as np
+        return tuple(
+            np.asarray(column).view(np.int64)
+            for column in (self.weights, self.volumes, self.values)
+        )
+
+    def tolist(self):
+        # Lista de (peso, volume, valor): pro código em Python puro que
+        # indexa itens muitas vezes (tupla numa lista é o acesso mais barato)
+        return list(zip(self.weights.tolist(), self.volumes.tolist(), self.values.tolist()))
+
+    @property
+    def ratios(self):
+        if self._ratios is None:
+            self._ratios = array("d", (
+                value / (weight + volume)
+                for weight, volume, value in zip(self.weights, self.volumes, self.values)
+            ))
+        return self._ratios
+
+    @property
+    def ratio_order(self):
+        if self._ratio_order is None:
+            ratios = self.ratios
+            self._ratio_order = sorted(
+                range(len(ratios)), key=ratios.__getitem__, reverse=True
+            )
+        return self._ratio_order
+
+
+def as_item_set(items):
+    # items como ItemSet (lista de tuplas é convertida, ItemSet passa direto)
+    return items if isinstance(items, ItemSet) else ItemSet.from_tuples(items)
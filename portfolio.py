@@ -0,0 +1,220 @@
+# portfolio.py
+# Escolhe automaticamente o solver (DP, Branch and Bound ou Backtracking)
+# a partir de características baratas da instância, com a opção de correr
+# dois solvers em paralelo e ficar com o primeiro que terminar.
+
+import math
+import multiprocessing
+import queue
+import statistics
+import sys
+import time
+
+from dynamic_programming import solve_with_traceback_3d
+import branch_and_bound
+from backtracking import solve_backtracking_2d
+from item_set import ItemSet
+from preprocessing import reduce_instance, restore_solution
+
+try:
+    from dynamic_programming_numpy import solve_vectorized
+except ImportError:
+    solve_vectorized = None
+
+# Custo aproximado por célula (w, v) de cada item na DP, medido nas
+# instâncias de instancias/ (~0.4 us em Python puro, ~3 ns com NumPy)
+PYTHON_CELL_SECONDS = 4e-7
+NUMPY_CELL_SECONDS = 3e-9
+
+# Abaixo disso a DP é tão barata que não vale arriscar a busca
+FAST_DP_SECONDS = 1e-3
+# Até aqui o backtracking ganha (menos preparação que o B&B)
+SMALL_N = 12
+# Densidades espalhadas (coef. de variação) deixam o bound do B&B forte
+EASY_SPREAD = 0.25
+# Até aqui o B&B com bound surrogate foi sempre rápido nas instâncias
+BB_SAFE_N = 40
+# Tempo de DP aceitável quando a busca parece difícil
+DP_BUDGET_SECONDS = 2.0
+
+
+def extract_features(max_weight, max_volume, items):
+    # Características baratas (O(n)) usadas na escolha do solver
+    n = len(items)
+    total_weight = sum(w for w, v, val in items)
+    total_volume = sum(v for w, v, val in items)
+    densities = [val / (w + v) for w, v, val in items]
+
+    spread = 0.0
+    if n > 1:
+        spread = statistics.pstdev(densities) / statistics.mean(densities)
+
+    return {
+        'n_itens': n,
+        'celulas_dp': n * (max_weight + 1) * (max_volume + 1),
+        'espalhamento_densidade': spread,
+        # > 1: nem todos os itens cabem; quanto maior, mais apertado
+        # (capacidade zero: infinitamente apertado)
+        'aperto_peso': total_weight / max_weight if max_weight > 0 else math.inf,
+        'aperto_volume': total_volume / max_volume if max_volume > 0 else math.inf,
+    }
+
+
+def choose_solvers(features):
+    """
+    Retorna os solvers ("dp", "bb", "bt") do mais pro menos promissor.
+    As regras vêm do benchmark: a DP custa O(n * W * V) e não depende da
+    ordem dos itens, enquanto BB e BT são exponenciais em n mas podam
+    bem quando as densidades são bem distintas.
+    """
+    cell_seconds = NUMPY_CELL_SECONDS if solve_vectorized else PYTHON_CELL_SECONDS
+    dp_seconds = features['celulas_dp'] * cell_seconds
+
+    if dp_seconds <= FAST_DP_SECONDS:
+        return ["dp", "bb"]
+    # Capacidade zero (aperto infinito): o backtracking exige capacidades
+    # positivas e a tabela da DP tem uma linha ou coluna só
+    if math.isinf(features['aperto_peso']) or math.isinf(features['aperto_volume']):
+        return ["dp", "bb"]
+    if features['n_itens'] <= SMALL_N:
+        return ["bt", "bb"]
+    if features['n_itens'] <= BB_SAFE_N or \
+       features['espalhamento_densidade'] >= EASY_SPREAD:
+        return ["bb", "dp"]
+    if dp_seconds <= DP_BUDGET_SECONDS:
+        return ["dp", "bb"]
+    return ["bb", "dp"]
+
+
+def run_solver(solver, max_weight, max_volume, items):
+    # Roda um solver e devolve (valor, selecionados)
+    # selecionados são índices originais
+    if solver == "dp":
+        solve = solve_vectorized or solve_with_traceback_3d
+        value, selected, _ = solve(max_weight, max_volume, items)
+        return value, selected
+
+    item_set = ItemSet.from_tuples(items)
+
+    if solver == "bb":
+        value, selected, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, item_set, bound_mode="surrogate"
+        )
+        return value, selected
+
+    if solver == "bt":
+        value, positions = solve_backtracking_2d(max_weight, max_volume, item_set)
+        order = item_set.ratio_order
+        return value, sorted(order[k] for k in positions)
+
+    raise ValueError(f"Solver desconhecido: {solver}")
+
+
+def _race_worker(solver, max_weight, max_volume, items, results):
+    results.put((solver, run_solver(solver, max_weight, max_volume, items)))
+
+
+def race(solvers, max_weight, max_volume, items):
+    """
+    Roda cada solver num processo e devolve (solver, (valor, selecionados))
+    do primeiro que terminar; os outros são mortos.
+    """
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=_race_worker,
+            args=(solver, max_weight, max_volume, items, results),
+            daemon=True
+        )
+        for solver in solvers
+    ]
+
+    for process in processes:
+        process.start()
+
+    try:
+        while True:
+            try:
+                return results.get(timeout=0.05)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes) \
+                   and results.empty():
+                    raise RuntimeError("Nenhum solver terminou a corrida")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+
+def solve(max_weight, max_volume, items, race_solvers=False, preprocess=True):
+    """
+    Resolve com o solver previsto como mais rápido (ou corre os dois
+    melhores em paralelo, com race_solvers=True). Com preprocess, a
+    instância passa antes por preprocessing.reduce_instance e as
+    características são extraídas da instância reduzida.
+
+    items: lista de (peso, volume, valor)
+    Retorna (max_value, selected, execution_time, solver)
+    """
+    start_time = time.perf_counter()
+
+    reduced = None
+    if preprocess:
+        reduced = reduce_instance(max_weight, max_volume, items)
+        max_weight, max_volume, items = (
+            reduced.max_weight, reduced.max_volume, reduced.items
+        )
+
+    # Tudo cabe: não há o que decidir
+    if sum(w for w, v, val in items) <= max_weight and \
+       sum(v for w, v, val in items) <= max_volume:
+        solver = "trivial"
+        value = sum(val for w, v, val in items)
+        selected = list(range(len(items)))
+    else:
+        features = extract_features(max_weight, max_volume, items)
+        candidates = choose_solvers(features)
+
+        if race_solvers:
+            solver, (value, selected) = race(
+                candidates[:2], max_weight, max_volume, items
+            )
+        else:
+            solver = candidates[0]
+            value, selected = run_solver(solver, max_weight, max_volume, items)
+
+    if reduced is not None:
+        value, selected = restore_solution(reduced, value, selected)
+
+    return value, selected, time.perf_counter() - start_time, solver
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python portfolio.py <arquivo_entrada> [--race] [--no-preprocess]")
+        sys.exit(1)
+
+    # import local: o portfólio roda sem NumPy, só a leitura precisa dele
+    from instance_loader import load_items
+
+    max_weight, max_volume, items = load_items(sys.argv[1])
+    race_solvers = "--race" in sys.argv[2:]
+    preprocess = "--no-preprocess" not in sys.argv[2:]
+
+    features = extract_features(max_weight, max_volume, items)
+    print(f"Características: {features}")
+    print(f"Ordem prevista: {choose_solvers(features)}")
+
+    max_value, selected, execution_time, solver = solve(
+        max_weight, max_volume, items, race_solvers, preprocess
+    )
+
+    print(f"Solver: {solver}")
+    print(f"Lucro Máximo: {max_value}")
+    print(f"Itens Selecionados: {selected}")
+    print(f"Tempo de Execução: {execution_time:.6f} segundos")
+
+
+if __name__ == "__main__":
+    main()
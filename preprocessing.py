@@ -0,0 +1,268 @@
+# preprocessing.py
+# Redução da instância antes de qualquer solver: tira itens que não cabem,
+# itens dominados, fixa itens por testes de bound e divide pesos/volumes
+# pelo MDC. A solução da instância reduzida volta pros índices originais
+# com restore_solution.
+
+from bisect import bisect_right
+from math import floor, gcd
+from typing import List, NamedTuple, Tuple
+
+from branch_and_bound import tune_multiplier
+from heuristics import heuristic_solution
+from item_set import ItemSet
+
+
+class ReducedInstance(NamedTuple):
+    max_weight: int
+    max_volume: int
+    # itens restantes (peso, volume, valor), já divididos pelo MDC
+    items: List[Tuple[int, int, int]]
+    # index_map[k] = índice original do k-ésimo item reduzido
+    index_map: List[int]
+    # índices originais fixados dentro da solução e o valor deles
+    fixed_items: List[int]
+    fixed_value: int
+
+
+def lp_bound(order, items, cap_weight, cap_volume, max_weight, max_volume,
+             mu, skip=None):
+    # Bound fracionário da relaxação surrogate com capacidades
+    # (cap_weight, cap_volume), percorrendo order (já em densidade
+    # surrogate decrescente) e ignorando o item skip
+    a = (1 - mu) / max_weight
+    b = mu / max_volume
+    remain = a * cap_weight + b * cap_volume
+
+    value = 0.0
+    for i in order:
+        if i == skip:
+            continue
+        weight, volume, item_value = items[i]
+        s = a * weight + b * volume
+        if s <= remain:
+            remain -= s
+            value += item_value
+        else:
+            value += item_value * (remain / s)
+            break
+
+    return value
+
+
+def make_lp_bound(order, items, max_weight, max_volume, mu):
+    """
+    Devolve bound(cap_weight, cap_volume, skip) com o mesmo valor de
+    lp_bound(order, items, cap_weight, cap_volume, max_weight, max_volume,
+    mu, skip), a menos de arredondamento.
+
+    Com a ordem fixa, o guloso é um intervalo contíguo de order (sem o
+    item skip): somas de prefixo + bisect dão o bound em O(log n), em vez
+    de percorrer os itens a cada teste.
+    """
+    a = (1 - mu) / max_weight
+    b = mu / max_volume
+    n = len(order)
+
+    sizes = [a * items[i][0] + b * items[i][1] for i in order]
+    values = [items[i][2] for i in order]
+    position = {i: k for k, i in enumerate(order)}
+
+    prefix_s = [0.0] * (n + 1)
+    prefix_val = [0] * (n + 1)
+    for k in range(n):
+        prefix_s[k + 1] = prefix_s[k] + sizes[k]
+        prefix_val[k + 1] = prefix_val[k] + values[k]
+
+    def bound(cap_weight, cap_volume, skip):
+        remain = a * cap_weight + b * cap_volume
+        p = position[skip]
+
+        # último prefixo que cabe inteiro
+        k = bisect_right(prefix_s, remain) - 1
+        if k < p:
+            # skip fica depois do item crítico: não muda nada
+            value = prefix_val[k]
+            target = remain
+        else:
+            # sem skip, os itens depois dele andam sizes[p] pra trás
+            target = remain + sizes[p]
+            k = max(bisect_right(prefix_s, target, p + 1) - 1, p + 1)
+            value = prefix_val[k] - values[p]
+
+        # fração do item crítico
+        if k < n:
+            value += values[k] * ((target - prefix_s[k]) / sizes[k])
+
+        return value
+
+    return bound
+
+
+def dominated(items, indices, max_weight, max_volume):
+    """
+    Itens removíveis por dominância: j sai se algum i restante tem peso e
+    volume <= e valor >= (com desempate pelo índice) e i e j não cabem
+    juntos. Aí toda solução com j troca j por i sem piorar. Cada remoção
+    vale na instância que sobra, então aplicar em sequência é seguro.
+    """
+    kept = list(indices)
+    removed = set()
+
+    for j in indices:
+        wj, vj, valj = items[j]
+        # i tem peso e volume <= os de j: se j cabe duas vezes, cabem juntos
+        if 2 * wj <= max_weight and 2 * vj <= max_volume:
+            continue
+        for i in kept:
+            if i == j or i in removed:
+                continue
+            wi, vi, vali = items[i]
+            if wi <= wj and vi <= vj and vali >= valj and \
+               ((wi, vi, vali) != (wj, vj, valj) or i < j) and \
+               (wi + wj > max_weight or vi + vj > max_volume):
+                removed.add(j)
+                break
+
+    return [i for i in indices if i not in removed]
+
+
+def reduce_instance(max_weight, max_volume, items):
+    """
+    Reduz a instância (lista de (peso, volume, valor)) até não mudar mais:
+
+    - remove itens que não cabem sozinhos (peso > W ou volume > V)
+    - remove itens dominados (ver dominated), uma vez, no começo
+    - com o limite inferior LB de heuristics.heuristic_solution e o
+      bound surrogate UB: fixa fora
+      o item j se UB(com j) < LB e fixa dentro se UB(sem j) < LB
+      (desigualdade estrita: nenhuma solução ótima é perdida); cada volta
+      testa todos os itens e aplica as fixações juntas
+    - divide pesos e capacidade de peso pelo MDC dos pesos (idem volume)
+
+    Retorna um ReducedInstance; o ótimo original é o ótimo reduzido +
+    fixed_value.
+    """
+    fixed_items = []
+    fixed_value = 0
+    cap_weight, cap_volume = max_weight, max_volume
+
+    # Dominância uma vez só: tirar itens e baixar capacidades nunca faz um
+    # item dominado voltar a ser útil (o par continua sem caber junto, e os
+    # testes de bound que tiram ou fixam quem domina valeriam pro dominado)
+    indices = [
+        i for i in range(len(items))
+        if items[i][0] <= cap_weight and items[i][1] <= cap_volume
+    ]
+    indices = dominated(items, indices, cap_weight, cap_volume)
+
+    # Incumbente da heurística (índices originais) e seu valor no que resta
+    # da instância; só é recalculado se algum item dele sai da instância
+    incumbent = None
+    lower = 0
+
+    while indices:
+        # itens que não cabem (as capacidades caem ao fixar itens dentro)
+        indices = [
+            i for i in indices
+            if items[i][0] <= cap_weight and items[i][1] <= cap_volume
+        ]
+        if not indices:
+            break
+
+        # testes de bound
+        if incumbent is None or not incumbent.issubset(indices):
+            # primeira volta, ou um item do incumbente saiu da instância
+            lower, chosen = heuristic_solution(
+                cap_weight, cap_volume, [items[i] for i in indices]
+            )
+            incumbent = {indices[k] for k in chosen}
+
+        bb_items = ItemSet.from_tuples([items[i] for i in indices])
+        mu = tune_multiplier(bb_items, max(cap_weight, 1), max(cap_volume, 1))
+        a = (1 - mu) / max(cap_weight, 1)
+        b = mu / max(cap_volume, 1)
+        order = sorted(
+            indices,
+            key=lambda i: items[i][2] / (a * items[i][0] + b * items[i][1]),
+            reverse=True
+        )
+        bound = make_lp_bound(
+            order, items, max(cap_weight, 1), max(cap_volume, 1), mu
+        )
+
+        # os valores são inteiros: o melhor valor possível é floor(bound)
+        # (a folga cobre o erro de ponto flutuante do bound)
+        # Todos os testes da volta usam as mesmas capacidades e o mesmo
+        # lower: toda solução que alcança lower (a ótima inclusive) usa
+        # todos os fixados dentro e nenhum dos fixados fora, então dá pra
+        # aplicar tudo de uma vez
+        fixed_in = []
+        fixed_out = set()
+        for j in indices:
+            weight, volume, value = items[j]
+
+            # com j: o resto cabe no que sobra (o incumbente não usa j, ou
+            # teria bound >= lower)
+            if floor(value + bound(cap_weight - weight, cap_volume - volume, j)
+                     + 1e-6) < lower:
+                fixed_out.add(j)
+                continue
+
+            # sem j: nem o bound alcança a heurística, então j é obrigatório
+            if floor(bound(cap_weight, cap_volume, j) + 1e-6) < lower:
+                fixed_in.append(j)
+                fixed_out.add(j)
+
+        if not fixed_out:
+            break
+
+        for j in fixed_in:
+            weight, volume, value = items[j]
+            fixed_items.append(j)
+            fixed_value += value
+            cap_weight -= weight
+            cap_volume -= volume
+            # o incumbente alcança lower, então também usa j: sem j ele
+            # continua viável nas capacidades que sobram
+            if j in incumbent:
+                incumbent.discard(j)
+                lower -= value
+            else:
+                incumbent = None
+
+        indices = [i for i in indices if i not in fixed_out]
+
+    # MDC dos pesos e dos volumes restantes
+    weight_gcd = 0
+    volume_gcd = 0
+    for i in indices:
+        weight_gcd = gcd(weight_gcd, items[i][0])
+        volume_gcd = gcd(volume_gcd, items[i][1])
+    weight_gcd = weight_gcd or 1
+    volume_gcd = volume_gcd or 1
+
+    reduced_items = [
+        (items[i][0] // weight_gcd, items[i][1] // volume_gcd, items[i][2])
+        for i in indices
+    ]
+
+    return ReducedInstance(
+        max_weight=cap_weight // weight_gcd,
+        max_volume=cap_volume // volume_gcd,
+        items=reduced_items,
+        index_map=indices,
+        fixed_items=sorted(fixed_items),
+        fixed_value=fixed_value,
+    )
+
+
+def restore_solution(reduced, max_value, selected):
+    # Leva (valor, selecionados) da instância reduzida pra original
+    # selected None (solver sem seleção) continua None
+    value = max_value + reduced.fixed_value
+    if selected is None:
+        return value, None
+
+    original = [reduced.index_map[k] for k in selected] + reduced.fixed_items
+    return value, sorted(original)
@@ -0,0 +1,466 @@
+# scaling_benchmark.py
+# Benchmark de escala: gera em memória uma grade (família, n, W, V), mede
+# cada solver, ajusta curvas de crescimento empíricas e aponta os pontos
+# de cruzamento onde o solver mais rápido muda. Separa o efeito da
+# capacidade (DP, O(n * W * V)) do efeito do número de itens (BB e BT).
+
+import argparse
+import csv
+import math
+import statistics
+
+import numpy as np
+
+import branch_and_bound
+from backtracking import solve_backtracking_2d
+from benchmark_runner import time_solve
+from dynamic_programming import solve_with_traceback_3d
+from generate_instances import FAMILIES, generate_items, instance_seed
+from item_set import ItemSet
+
+try:
+    from dynamic_programming_numpy import solve_vectorized
+except ImportError:
+    solve_vectorized = None
+
+# W e V são essa fração da soma dos pesos e dos volumes dos itens
+TIGHTNESS = 0.3
+
+# Faixa de valores com que a família é gerada antes de ser ajustada às
+# capacidades da grade (ver grid_instance)
+GRID_VALUE_RANGE = 1000
+GRID_RANGE_STEPS = 5
+
+# Eixo cuja capacidade já fica entre (1 ± isso) * TIGHTNESS da soma não é
+# reescalado (a folga real varia um pouco em volta de TIGHTNESS)
+TIGHTNESS_TOLERANCE = 0.1
+
+# Erro de arredondamento máximo (fração da soma de pesos ou de volumes) ao
+# reescalar os itens; acima disso o ponto da grade é pulado
+MAX_ROUNDING_ERROR = 0.05
+
+# Acima disso a DP nem roda (conta como não terminada): ~1 s em Python
+# puro; a versão NumPy aguenta bem mais, limitada pela memória das decisões
+MAX_DP_CELLS = 2_000_000
+MAX_NUMPY_CELLS = 50_000_000
+
+# Modelos de crescimento: nome -> (x da regressão de log(tempo), fórmula)
+GROWTH_MODELS = {
+    "potencia_celulas": (
+        lambda n, w, v: math.log(n * (w + 1) * (v + 1)),
+        "t = a * (n*W*V)^b",
+    ),
+    "potencia_n": (lambda n, w, v: math.log(n), "t = a * n^b"),
+    "exponencial_n": (lambda n, w, v: n, "t = a * e^(b*n)"),
+}
+
+AXES = ("n_itens", "peso_max", "volume_max")
+
+
+def _scale_factors(items, max_weight, max_volume, tightness):
+    # Fatores que levam as somas de peso e de volume a W / tightness e
+    # V / tightness
+    return (
+        max_weight / (tightness * int(items[:, 0].sum())),
+        max_volume / (tightness * int(items[:, 1].sum())),
+    )
+
+
+def grid_instance(family, n_items, max_weight, max_volume, seed,
+                  tightness=TIGHTNESS):
+    """
+    Itens da família (generate_instances) com pesos e volumes
+    reescalados pra que W e V sejam tightness das somas (a menos de
+    TIGHTNESS_TOLERANCE).
+
+    A família é gerada com um value_range (R) que já deixa o eixo mais
+    apertado perto da escala certa, e só então peso e volume são
+    multiplicados (o outro eixo por um fator >= ~1). Reescalar os itens
+    de R = 1000 direto pra capacidades pequenas arredondava pesos
+    diferentes pro mesmo inteiro e desfazia a correlação da família.
+    Retorna None se mesmo assim o arredondamento muda as somas de peso ou
+    de volume em mais de MAX_ROUNDING_ERROR (ponto pulado na grade).
+    """
+    if n_items == 0:
+        return []
+
+    # pesos e volumes crescem ~linearmente com R em todas as famílias; com
+    # R pequeno o sorteio em [1, R] pesa mais, então R é corrigido algumas
+    # vezes até o eixo mais apertado ficar perto da escala 1
+    value_range = GRID_VALUE_RANGE
+    items = generate_items(family, n_items, seed, value_range)
+    for _ in range(GRID_RANGE_STEPS):
+        shrink = min(_scale_factors(items, max_weight, max_volume, tightness))
+        if abs(shrink - 1) <= TIGHTNESS_TOLERANCE:
+            break
+        new_range = max(1, round(value_range * shrink))
+        if new_range == value_range:
+            break
+        value_range = new_range
+        items = generate_items(family, n_items, seed, value_range)
+
+    scaled = []
+    for column, factor in enumerate(_scale_factors(items, max_weight, max_volume, tightness)):
+        # já perto da escala: arredondar de novo só distorceria os itens
+        if abs(factor - 1) <= TIGHTNESS_TOLERANCE:
+            scaled.append(items[:, column])
+            continue
+
+        exact = items[:, column] * factor
+        rounded = np.maximum(1, np.rint(exact)).astype(np.int64)
+        if np.abs(rounded - exact).sum() > MAX_ROUNDING_ERROR * exact.sum():
+            return None
+        scaled.append(rounded)
+
+    return list(zip(scaled[0].tolist(), scaled[1].tolist(), items[:, 2].tolist()))
+
+
+def make_solver(solver, max_weight, max_volume, items, time_limit):
+    # Devolve solve() -> (valor, otimalidade provada), ou None se o
+    # solver não deve rodar nessa instância (DP grande demais)
+    cells = len(items) * (max_weight + 1) * (max_volume + 1)
+
+    if solver == "dp":
+        if cells > MAX_DP_CELLS:
+            return None
+        return lambda: (solve_with_traceback_3d(max_weight, max_volume, items)[0], True)
+
+    if solver == "dp_numpy":
+        if solve_vectorized is None or cells > MAX_NUMPY_CELLS:
+            return None
+        return lambda: (solve_vectorized(max_weight, max_volume, items)[0], True)
+
+    item_set = ItemSet.from_tuples(items)
+
+    if solver == "bb":
+        def solve():
+            stats = {}
+            value, _, _, _ = branch_and_bound.solve(
+                max_weight, max_volume, item_set,
+                bound_mode="surrogate", time_limit=time_limit, stats=stats
+            )
+            return value, stats["optimal"]
+        return solve
+
+    if solver == "bt":
+        def solve():
+            stats = {}
+            value, _ = solve_backtracking_2d(
+                max_weight, max_volume, item_set,
+                stats=stats, time_limit=time_limit
+            )
+            return value, stats["optimal"]
+        return solve
+
+    raise ValueError(f"Solver desconhecido: {solver}")
+
+
+def run_grid(families, sizes, weights, volumes, solvers, instances=3,
+             repeats=1, warmup=0, time_limit=5.0, base_seed=0):
+    """
+    Mede cada solver em cada célula da grade (instances instâncias por
+    célula). Retorna uma linha por (célula, solver) com tempo = mediana
+    entre as instâncias; otimo é False se alguma execução parou no
+    limite de tempo ou se o solver não rodou (tempo None). Células em que
+    grid_instance não consegue reescalar a família ficam de fora.
+    """
+    rows = []
+
+    for family in families:
+        for n_items in sizes:
+            for max_weight in weights:
+                for max_volume in volumes:
+                    cell = [
+                        grid_instance(
+                            family, n_items, max_weight, max_volume,
+                            instance_seed(
+                                f"{family}_{n_items}_{max_weight}_{max_volume}_{i}",
+                                base_seed
+                            )
+                        )
+                        for i in range(instances)
+                    ]
+                    if any(items is None for items in cell):
+                        print(
+                            f"  {family:18} n={n_items:5} W={max_weight:6} V={max_volume:6} | "
+                            "pulado: capacidades pequenas demais pra família "
+                            "sem distorcer os itens"
+                        )
+                        continue
+
+                    times = {solver: [] for solver in solvers}
+                    finished = {solver: True for solver in solvers}
+
+                    for items in cell:
+                        reference = None
+
+                        for solver in solvers:
+                            solve = make_solver(
+                                solver, max_weight, max_volume, items, time_limit
+                            )
+                            if solve is None:
+                                finished[solver] = False
+                                continue
+
+                            (value, optimal), solver_times = time_solve(
+                                solve, repeats, warmup
+                            )
+                            times[solver].append(statistics.median(solver_times))
+                            finished[solver] = finished[solver] and optimal
+
+                            # todo solver que provou o ótimo tem que concordar
+                            if optimal:
+                                if reference is not None and value != reference:
+                                    raise ValueError(
+                                        f"Valores diferentes em {family} n={n_items} "
+                                        f"W={max_weight} V={max_volume}: "
+                                        f"{solver}={value}, esperado {reference}"
+                                    )
+                                reference = value
+
+                    for solver in solvers:
+                        median = (
+                            statistics.median(times[solver])
+                            if len(times[solver]) == instances else None
+                        )
+                        rows.append({
+                            "familia": family,
+                            "n_itens": n_items,
+                            "peso_max": max_weight,
+                            "volume_max": max_volume,
+                            "solver": solver,
+                            "tempo": median,
+                            "otimo": finished[solver],
+                        })
+
+                    print(
+                        f"  {family:18} n={n_items:5} W={max_weight:6} V={max_volume:6} | "
+                        + " | ".join(
+                            f"{row['solver']}: " + (
+                                f"{row['tempo'] * 1000:9.2f}ms"
+                                + (" " if row["otimo"] else "*")
+                                if row["tempo"] is not None else "        --- "
+                            )
+                            for row in rows[-len(solvers):]
+                        )
+                    )
+
+    return rows
+
+
+def fit_growth(rows):
+    """
+    Ajusta, por (solver, família), log(tempo) = log(a) + b * x pra cada
+    modelo de GROWTH_MODELS, só com as execuções que terminaram.
+    Retorna [(solver, família, modelo, a, b, r2, pontos)] com o melhor
+    modelo (maior r2) primeiro em cada (solver, família).
+    """
+    series = {}
+    for row in rows:
+        if row["otimo"] and row["tempo"]:
+            series.setdefault((row["solver"], row["familia"]), []).append(row)
+
+    fits = []
+    for (solver, family), points in sorted(series.items()):
+        found = []
+        for model, (feature, _) in GROWTH_MODELS.items():
+            xs = [feature(p["n_itens"], p["peso_max"], p["volume_max"]) for p in points]
+            ys = [math.log(p["tempo"]) for p in points]
+
+            # precisa de variação em x (e em y, pra correlação existir)
+            if len(set(xs)) < 3 or len(set(ys)) < 2:
+                continue
+
+            slope, intercept = statistics.linear_regression(xs, ys)
+            r2 = statistics.correlation(xs, ys) ** 2
+            found.append((solver, family, model, math.exp(intercept), slope, r2, len(points)))
+
+        found.sort(key=lambda fit: fit[5], reverse=True)
+        fits.extend(found)
+
+    return fits
+
+
+def fastest(rows):
+    # {(família, n, W, V): (solver mais rápido, {solver: tempo})}, só com
+    # quem terminou
+    cells = {}
+    for row in rows:
+        if row["otimo"] and row["tempo"] is not None:
+            key = (row["familia"], row["n_itens"], row["peso_max"], row["volume_max"])
+            cells.setdefault(key, {})[row["solver"]] = row["tempo"]
+
+    return {
+        key: (min(times, key=times.get), times)
+        for key, times in cells.items()
+    }
+
+
+def crossovers(rows):
+    """
+    Pontos onde o solver mais rápido muda ao longo de cada eixo (n, W, V)
+    com os outros fixos. O ponto estimado interpola log(t_antes / t_depois)
+    linearmente entre as duas células vizinhas.
+    Retorna [dict] com eixo, família, valores fixos, intervalo, solvers e
+    o ponto estimado.
+    """
+    winners = fastest(rows)
+    found = []
+
+    for axis_index, axis in enumerate(AXES):
+        lines = {}
+        for key in winners:
+            family, coords = key[0], key[1:]
+            fixed = tuple(c for i, c in enumerate(coords) if i != axis_index)
+            lines.setdefault((family, fixed), []).append(coords[axis_index])
+
+        for (family, fixed), positions in sorted(lines.items()):
+            positions.sort()
+
+            for x0, x1 in zip(positions, positions[1:]):
+                key0 = _cell(family, fixed, axis_index, x0)
+                key1 = _cell(family, fixed, axis_index, x1)
+                before, times0 = winners[key0]
+                after, times1 = winners[key1]
+                if before == after:
+                    continue
+
+                point = None
+                if after in times0 and before in times1:
+                    r0 = math.log(times0[before] / times0[after])
+                    r1 = math.log(times1[before] / times1[after])
+                    if r0 != r1:
+                        point = x0 + (x1 - x0) * r0 / (r0 - r1)
+
+                others = [a for i, a in enumerate(AXES) if i != axis_index]
+                found.append({
+                    "eixo": axis,
+                    "familia": family,
+                    "fixos": " ".join(f"{a}={c}" for a, c in zip(others, fixed)),
+                    "de": x0,
+                    "ate": x1,
+                    "mais_rapido_antes": before,
+                    "mais_rapido_depois": after,
+                    "ponto_estimado": point,
+                })
+
+    return found
+
+
+def _cell(family, fixed, axis_index, value):
+    # Reconstrói a chave (família, n, W, V) de uma célula de um eixo
+    coords = list(fixed)
+    coords.insert(axis_index, value)
+    return (family, *coords)
+
+
+def save_grid_csv(rows, filename):
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=[
+            "familia", "n_itens", "peso_max", "volume_max", "solver",
+            "tempo_ms", "otimo",
+        ])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({
+                "familia": row["familia"],
+                "n_itens": row["n_itens"],
+                "peso_max": row["peso_max"],
+                "volume_max": row["volume_max"],
+                "solver": row["solver"],
+                "tempo_ms": f"{row['tempo'] * 1000:.3f}" if row["tempo"] is not None else "",
+                "otimo": int(row["otimo"]),
+            })
+    print(f"\nGrade salva em: {filename}")
+
+
+def save_crossovers_csv(points, filename):
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=[
+            "eixo", "familia", "fixos", "de", "ate",
+            "mais_rapido_antes", "mais_rapido_depois", "ponto_estimado",
+        ])
+        writer.writeheader()
+        for point in points:
+            row = dict(point)
+            if row["ponto_estimado"] is not None:
+                row["ponto_estimado"] = f"{row['ponto_estimado']:.1f}"
+            writer.writerow(row)
+    print(f"Cruzamentos salvos em: {filename}")
+
+
+def print_report(fits, points):
+    print("\n" + "=" * 100)
+    print("CURVAS DE CRESCIMENTO (melhor modelo primeiro)")
+    print("=" * 100)
+
+    for solver, family, model, a, b, r2, count in fits:
+        print(
+            f"  {solver:8} {family:18} {GROWTH_MODELS[model][1]:18} "
+            f"a={a:.3e} b={b:7.3f} R²={r2:.3f} ({count} pontos)"
+        )
+
+    print("\n" + "=" * 100)
+    print("CRUZAMENTOS (solver mais rápido muda)")
+    print("=" * 100)
+
+    if not points:
+        print("  Nenhum: o mesmo solver ganhou em toda a grade")
+
+    for point in points:
+        estimate = (
+            f"~{point['ponto_estimado']:.1f}"
+            if point["ponto_estimado"] is not None else "?"
+        )
+        print(
+            f"  {point['eixo']:10} {point['familia']:18} {point['fixos']:28} | "
+            f"{point['mais_rapido_antes']} -> {point['mais_rapido_depois']} "
+            f"entre {point['de']} e {point['ate']} (ponto {estimate})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de escala: grade n x W x V x família"
+    )
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=FAMILIES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 20, 40, 80])
+    parser.add_argument("--weights", nargs="+", type=int, default=[50, 200, 800])
+    parser.add_argument("--volumes", nargs="+", type=int, default=[50, 200])
+    parser.add_argument(
+        "--solvers", nargs="+", default=["dp", "dp_numpy", "bb", "bt"],
+        choices=["dp", "dp_numpy", "bb", "bt"]
+    )
+    parser.add_argument("--instances", type=int, default=3, help="instâncias por célula")
+    parser.add_argument("--repeats", type=int, default=1, help="execuções medidas por instância")
+    parser.add_argument("--warmup", type=int, default=0, help="execuções descartadas")
+    parser.add_argument(
+        "--time-limit", type=float, default=5.0,
+        help="limite (s) por execução de BB e BT; quem estoura não conta nos ajustes"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="semente base da grade")
+    parser.add_argument("--output", default="scaling_grid.csv", help="CSV da grade")
+    parser.add_argument(
+        "--crossovers-output", default="scaling_crossovers.csv",
+        help="CSV dos cruzamentos"
+    )
+    args = parser.parse_args()
+
+    print("=" * 100)
+    print("BENCHMARK DE ESCALA – MOCHILA 0-1 (2 RESTRIÇÕES)")
+    print("=" * 100)
+
+    rows = run_grid(
+        args.families, args.sizes, args.weights, args.volumes, args.solvers,
+        args.instances, args.repeats, args.warmup, args.time_limit, args.seed
+    )
+    fits = fit_growth(rows)
+    points = crossovers(rows)
+
+    save_grid_csv(rows, args.output)
+    save_crossovers_csv(points, args.crossovers_output)
+    print_report(fits, points)
+
+
+if __name__ == "__main__":
+    main()
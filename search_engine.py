@@ -0,0 +1,174 @@
+# search_engine.py
+# Núcleo de busca em profundidade iterativo, compartilhado pelo
+# backtracking e pelo Branch and Bound (mochila 0-1 com peso e volume)
+
+import math
+import time
+
+from solver_stats import add_counts, timed_bound
+
+
+def depth_first_search(max_weight, max_volume, weights, volumes, values,
+                       bound_fn, best_value=0, start_index=0,
+                       start_weight=0, start_volume=0, start_value=0,
+                       on_improve=None, time_limit=None, max_nodes=None,
+                       stats=None):
+    """
+    Explora a árvore inclui/exclui em profundidade (ramo inclui primeiro)
+    com uma pilha explícita: um nível por item, guardado em listas
+    pré-alocadas. Não há recursão nem alocação por nó, então n pode
+    passar do limite de recursão do Python.
+
+    weights, volumes e values são arrays paralelos já na ordem de
+    ramificação escolhida pelo solver. bound_fn(idx, cur_w, cur_v, cur_val)
+    devolve um limite superior pro nó; nós com bound <= incumbente são
+    podados.
+
+    A busca pode começar num nó interno (start_*), útil pra resolver
+    subárvores. best_value é o incumbente inicial e on_improve(valor), se
+    dado, é chamado a cada nova melhor solução.
+
+    time_limit (segundos) e max_nodes limitam a busca; ao estourar, ela
+    para e devolve o incumbente atual (comportamento anytime).
+
+    Se stats for um dict, soma nele pruned_infeasible, pruned_bound e
+    bound_evals (e bound_time, se veio de solver_stats.new_stats).
+
+    Retorna (best_value, selected, node_count, upper_bound), onde selected
+    são as posições dos itens da melhor solução encontrada na subárvore
+    (None se nenhuma supera o incumbente inicial) e upper_bound limita o
+    ótimo da subárvore. upper_bound == best_value quando a busca terminou,
+    ou seja, a otimalidade foi provada.
+    """
+    n = len(values)
+
+    node_limit = max_nodes if max_nodes is not None else math.inf
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    stopped = False
+
+    # estado de cada nível da pilha
+    cur_w = [0] * (n + 1)
+    cur_v = [0] * (n + 1)
+    cur_val = [0] * (n + 1)
+    # ramo já aberto em cada nível: 1 = inclui, 2 = exclui
+    branch = [0] * (n + 1)
+    taken = [False] * n
+
+    cur_w[start_index] = start_weight
+    cur_v[start_index] = start_volume
+    cur_val[start_index] = start_value
+
+    best = best_value
+    best_taken = None
+    node_count = 0
+    pruned_infeasible = 0
+    pruned_bound = 0
+    bound_evals = 0
+    bound_fn = timed_bound(bound_fn, stats)
+
+    depth = start_index
+    while True:
+        # orçamento de nós / tempo (relógio conferido a cada 1024 nós)
+        if node_count >= node_limit or (
+            deadline is not None
+            and not node_count & 1023
+            and time.perf_counter() > deadline
+        ):
+            stopped = True
+            break
+
+        node_count += 1
+
+        w = cur_w[depth]
+        v = cur_v[depth]
+        val = cur_val[depth]
+
+        # viola restrições
+        if w > max_weight or v > max_volume:
+            pruned_infeasible += 1
+            expand = False
+        # fim da árvore
+        elif depth == n:
+            if val > best:
+                best = val
+                best_taken = taken[start_index:]
+                if on_improve is not None:
+                    on_improve(best)
+            expand = False
+        # poda por limite superior
+        else:
+            bound_evals += 1
+            expand = bound_fn(depth, w, v, val) > best
+            if not expand:
+                pruned_bound += 1
+
+        if expand:
+            # desce pelo ramo inclui
+            branch[depth] = 1
+            taken[depth] = True
+            cur_w[depth + 1] = w + weights[depth]
+            cur_v[depth + 1] = v + volumes[depth]
+            cur_val[depth + 1] = val + values[depth]
+            depth += 1
+            continue
+
+        # volta até o nível mais fundo que ainda tem o ramo exclui
+        depth -= 1
+        while depth >= start_index and branch[depth] == 2:
+            depth -= 1
+        if depth < start_index:
+            break
+
+        # desce pelo ramo exclui
+        branch[depth] = 2
+        taken[depth] = False
+        cur_w[depth + 1] = cur_w[depth]
+        cur_v[depth + 1] = cur_v[depth]
+        cur_val[depth + 1] = cur_val[depth]
+        depth += 1
+
+    upper_bound = best
+    if stopped:
+        upper_bound = max(best, open_bound(
+            max_weight, max_volume, n, bound_fn, start_index, depth,
+            branch, cur_w, cur_v, cur_val
+        ))
+
+    if stats is not None:
+        add_counts(
+            stats,
+            pruned_infeasible=pruned_infeasible,
+            pruned_bound=pruned_bound,
+            bound_evals=bound_evals
+        )
+
+    selected = None
+    if best_taken is not None:
+        selected = [
+            start_index + i for i, is_taken in enumerate(best_taken) if is_taken
+        ]
+
+    return best, selected, node_count, upper_bound
+
+
+def open_bound(max_weight, max_volume, n, bound_fn, start_index, depth,
+               branch, cur_w, cur_v, cur_val):
+    # Maior bound entre os nós ainda abertos numa busca interrompida:
+    # o nó que seria visitado agora e o ramo exclui pendente de cada
+    # nível da pilha. Arredonda pra baixo (valores inteiros), com folga
+    # pro erro de ponto flutuante do bound.
+    pending = [(depth, cur_w[depth], cur_v[depth], cur_val[depth])]
+    for level in range(start_index, depth):
+        if branch[level] == 1:
+            pending.append((level + 1, cur_w[level], cur_v[level], cur_val[level]))
+
+    result = 0
+    for idx, w, v, val in pending:
+        if w > max_weight or v > max_volume:
+            continue
+        node_bound = val if idx == n else bound_fn(idx, w, v, val)
+        result = max(result, math.floor(node_bound + 1e-6))
+
+    return result
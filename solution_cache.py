@@ -0,0 +1,214 @@
+# solution_cache.py
+# Cache persistente de soluções (SQLite) com uma camada LRU em memória.
+# A chave é um hash canônico de (W, V, itens ordenados, solver, opções),
+# então a mesma instância com os itens em outra ordem cai na mesma linha.
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+
+# Acertos na LRU em memória acumulados antes de gravar last_access no banco
+ACCESS_BATCH = 256
+
+
+def fingerprint(max_weight, max_volume, items, solver, options=None):
+    """
+    Retorna (key, order): key é o SHA-256 da forma canônica da instância
+    e order[k] é o índice original do k-ésimo item na ordem canônica
+    (itens ordenados por (peso, volume, valor)).
+    """
+    # int(): as linhas podem vir do NumPy (instance_loader), cujos int64
+    # o json não serializa
+    rows = [tuple(int(x) for x in item) for item in items]
+    order = sorted(range(len(rows)), key=rows.__getitem__)
+    canonical = [
+        int(max_weight),
+        int(max_volume),
+        [rows[i] for i in order],
+        solver,
+        options or {},
+    ]
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest(), order
+
+
+class SolutionCache:
+    """
+    Cache de soluções em disco, seguro entre processos (SQLite em modo
+    WAL, escrita em transação IMMEDIATE), com as entradas mais usadas
+    também numa LRU em memória.
+
+    Quando o total guardado passa de max_bytes, as entradas acessadas há
+    mais tempo são removidas. Acertos na LRU também contam como acesso:
+    o last_access deles vai pro banco em lotes (a cada ACCESS_BATCH
+    acertos, antes de cada put e no close). Use uma instância por processo.
+
+    A LRU é só deste processo e só de leitura: não vê o que outros
+    processos gravam ou removem depois. Isso não muda a resposta porque
+    só ótimos provados entram no cache (cached_solve descarta execuções
+    interrompidas). Uma entrada regravada por outro processo tem o mesmo
+    valor; no máximo a seleção é outra, igualmente ótima.
+    """
+
+    def __init__(self, path="solutions.sqlite", max_bytes=64 * 1024 * 1024,
+                 memory_entries=1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        # key -> horário dos acertos na LRU ainda não gravados no banco
+        self.touched = {}
+
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            " key TEXT PRIMARY KEY,"
+            " value INTEGER NOT NULL,"
+            " selected TEXT NOT NULL,"
+            " proved_by TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS solutions_access"
+            " ON solutions (last_access)"
+        )
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, max_weight, max_volume, items, solver, options=None):
+        """
+        Retorna (valor, selecionados, proved_by) com os índices na ordem
+        original de items, ou None se a instância não está no cache.
+        """
+        key, order = fingerprint(max_weight, max_volume, items, solver, options)
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+            self.touched[key] = time.time()
+            if len(self.touched) >= ACCESS_BATCH:
+                self._flush_access()
+        else:
+            row = self.conn.execute(
+                "SELECT value, selected, proved_by FROM solutions WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            entry = (row[0], json.loads(row[1]), row[2])
+            self._remember(key, entry)
+
+            self.conn.execute(
+                "UPDATE solutions SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+
+        value, canonical_selected, proved_by = entry
+        selected = sorted(order[k] for k in canonical_selected)
+        return value, selected, proved_by
+
+    def put(self, max_weight, max_volume, items, solver, value, selected,
+            options=None, proved_by=None):
+        """
+        Guarda uma solução (selected com índices na ordem original).
+        proved_by registra o solver que provou o valor (padrão: solver).
+        """
+        key, order = fingerprint(max_weight, max_volume, items, solver, options)
+        value = int(value)
+        position = {original: k for k, original in enumerate(order)}
+        canonical_selected = sorted(position[i] for i in selected)
+        proved_by = proved_by or solver
+
+        selected_json = json.dumps(canonical_selected, separators=(",", ":"))
+        size = len(key) + len(selected_json) + len(proved_by) + 16
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # acessos pendentes antes do despejo, que ordena por last_access
+            self._flush_access()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO solutions"
+                " (key, value, selected, proved_by, size, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, selected_json, proved_by, size, time.time())
+            )
+            self._evict()
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        self._remember(key, (value, canonical_selected, proved_by))
+
+    def _flush_access(self):
+        # Grava o last_access dos acertos na LRU desde o último lote
+        if not self.touched:
+            return
+        self.conn.executemany(
+            "UPDATE solutions SET last_access = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self.touched.items()]
+        )
+        self.touched.clear()
+
+    def _evict(self):
+        # Remove as entradas menos acessadas até caber em max_bytes
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM solutions"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        stale = []
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM solutions ORDER BY last_access"
+        ):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self.conn.executemany("DELETE FROM solutions WHERE key = ?", stale)
+        for (key,) in stale:
+            self.memory.pop(key, None)
+
+    def close(self):
+        self._flush_access()
+        self.conn.close()
+
+
+def cached_solve(cache, solver, solve, max_weight, max_volume, items,
+                 options=None):
+    """
+    Consulta o cache e, se não achar, chama
+    solve(max_weight, max_volume, items, stats) -> (valor, selecionados, ...)
+    com stats um dict vazio.
+
+    O resultado só é guardado se for ótimo provado: quando o solver põe
+    stats["optimal"] = False (busca cortada por time_limit ou max_nodes),
+    ele é devolvido com proved_by None e não vai pro cache. Solvers que
+    não preenchem "optimal" (as DPs) são exatos.
+    Retorna (valor, selecionados, proved_by).
+    """
+    hit = cache.get(max_weight, max_volume, items, solver, options)
+    if hit is not None:
+        return hit
+
+    stats = {}
+    value, selected = solve(max_weight, max_volume, items, stats)[:2]
+    value = int(value)
+    if not stats.get("optimal", True):
+        return value, sorted(selected), None
+
+    cache.put(max_weight, max_volume, items, solver, value, selected, options)
+    return value, sorted(selected), solver
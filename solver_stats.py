@@ -0,0 +1,74 @@
+# solver_stats.py
+# Estatísticas comuns aos três solvers (DP, Branch and Bound, Backtracking).
+# Todo solver aceita stats=dict e soma nele os contadores de COUNTERS, além
+# de "incumbents": lista de (segundos desde o início, valor) a cada melhora.
+# O que custa medir (tempo dentro do bound) só é coletado quando o dict vem
+# de new_stats(); o pico de memória é medido por fora, com peak_memory.
+
+import time
+import tracemalloc
+
+COUNTERS = (
+    "node_count",          # nós visitados
+    "pruned_infeasible",   # nós cortados por estourar peso/volume
+    "pruned_bound",        # nós cortados pelo limite superior
+    "bound_evals",         # chamadas do bound
+    "dp_cells",            # células (ou estados) atualizados pela DP
+)
+
+
+def new_stats():
+    # Dict de perfilamento: contadores zerados, tempo no bound ligado
+    stats = {key: 0 for key in COUNTERS}
+    stats["bound_time"] = 0.0
+    stats["incumbents"] = []
+    return stats
+
+
+def add_counts(stats, **counts):
+    # Soma os contadores em stats (chamadas repetidas acumulam)
+    for key, value in counts.items():
+        stats[key] = stats.get(key, 0) + value
+
+
+def timed_bound(bound_fn, stats):
+    # Devolve bound_fn medido (soma em stats["bound_time"]) se stats veio
+    # de new_stats(); senão o próprio bound_fn, sem custo extra
+    if stats is None or "bound_time" not in stats:
+        return bound_fn
+
+    clock = time.perf_counter
+
+    def measured(idx, cur_w, cur_v, cur_val):
+        t0 = clock()
+        result = bound_fn(idx, cur_w, cur_v, cur_val)
+        stats["bound_time"] += clock() - t0
+        return result
+
+    return measured
+
+
+def incumbent_recorder(stats, start_time):
+    # Callback on_improve(valor) que anota (segundos, valor) em
+    # stats["incumbents"]; None se não há stats
+    if stats is None:
+        return None
+
+    timeline = stats.setdefault("incumbents", [])
+
+    def record(value):
+        timeline.append((time.perf_counter() - start_time, value))
+
+    return record
+
+
+def peak_memory(solve):
+    # Roda solve() sob tracemalloc e devolve (resultado, pico em bytes)
+    # tracemalloc deixa o código bem mais lento: use fora da medição de tempo
+    tracemalloc.start()
+    try:
+        result = solve()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak
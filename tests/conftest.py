@@ -0,0 +1,49 @@
+# Os módulos ficam soltos na raiz do repositório
+import os
+import random
+import sys
+from itertools import combinations
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def brute_force(max_weight, max_volume, items):
+    # Ótimo por enumeração de todos os subconjuntos (só pra n pequeno)
+    best = 0
+    for size in range(1, len(items) + 1):
+        for subset in combinations(items, size):
+            if sum(w for w, _, _ in subset) <= max_weight and \
+               sum(v for _, v, _ in subset) <= max_volume:
+                best = max(best, sum(val for _, _, val in subset))
+    return best
+
+
+def random_instance(rng, n_max=10, weight_max=20, volume_max=20, value_max=30):
+    # (W, V, items) com capacidades entre ~1/4 e ~3/4 da soma dos itens
+    n = rng.randint(0, n_max)
+    items = [
+        (rng.randint(1, weight_max), rng.randint(1, volume_max), rng.randint(1, value_max))
+        for _ in range(n)
+    ]
+    total_weight = sum(w for w, _, _ in items)
+    total_volume = sum(v for _, v, _ in items)
+    max_weight = rng.randint(1, max(1, 3 * total_weight // 4))
+    max_volume = rng.randint(1, max(1, 3 * total_volume // 4))
+    return max_weight, max_volume, items
+
+
+def check_selection(max_weight, max_volume, items, value, selected):
+    # selected é viável, sem repetição e soma exatamente value
+    assert len(set(selected)) == len(selected)
+    assert sum(items[i][0] for i in selected) <= max_weight
+    assert sum(items[i][1] for i in selected) <= max_volume
+    assert sum(items[i][2] for i in selected) == value
+
+
+@pytest.fixture
+def instances():
+    # Mesma sequência de instâncias em toda execução
+    rng = random.Random(2026)
+    return [random_instance(rng) for _ in range(60)]
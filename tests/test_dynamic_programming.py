@@ -0,0 +1,151 @@
+import gc
+import os
+import random
+import tempfile
+import weakref
+
+import numpy as np
+import pytest
+
+import dynamic_programming_numpy
+
+from conftest import brute_force, check_selection
+from dynamic_programming import solve_approximate, solve_pareto, solve_with_traceback_3d
+from dynamic_programming_numpy import (
+    solve_batch, solve_low_memory, solve_out_of_core, solve_threaded, solve_vectorized,
+)
+
+
+SOLVERS = [
+    solve_with_traceback_3d,
+    solve_vectorized,
+    solve_low_memory,
+    lambda W, V, items: solve_threaded(W, V, items, threads=2, tile_rows=3),
+    lambda W, V, items: solve_out_of_core(W, V, items, tile_rows=3),
+    lambda W, V, items: solve_out_of_core(W, V, items, tile_rows=3, threads=2),
+    solve_pareto,
+]
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+def test_dp_matches_brute_force(solver, instances):
+    for max_weight, max_volume, items in instances:
+        value, selected, _ = solver(max_weight, max_volume, items)
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+def test_batch_matches_brute_force(instances):
+    # max_cells pequeno força vários lotes por grupo de (W, V)
+    instances = instances + [(10, 10, items) for _, _, items in instances[:10]]
+    results = solve_batch(instances, max_cells=2000)
+
+    for (max_weight, max_volume, items), (value, selected, _) in zip(instances, results):
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+def test_batch_stacks_shared_shapes(monkeypatch):
+    # Instâncias com as mesmas listas de formatos (peso, volume), valores e
+    # tamanhos diferentes: resolvidas empilhadas, não uma a uma
+    def no_loop(*args, **kwargs):
+        raise AssertionError("lote resolvido instância por instância")
+
+    monkeypatch.setattr(dynamic_programming_numpy, "solve_vectorized", no_loop)
+    rng = random.Random(18)
+    shape_lists = [
+        [(rng.randint(1, 8), rng.randint(1, 8)) for _ in range(6)] for _ in range(3)
+    ]
+    instances = []
+    for _ in range(40):
+        shapes = rng.choice(shape_lists)[:rng.randint(4, 6)]
+        items = [(w, v, rng.randint(1, 20)) for w, v in shapes]
+        instances.append((15, 15, items))
+
+    results = solve_batch(instances, max_cells=40_000)
+    for (max_weight, max_volume, items), (value, selected, _) in zip(instances, results):
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+@pytest.mark.parametrize("threads", [0, -1])
+def test_threads_must_be_positive(threads):
+    with pytest.raises(ValueError):
+        solve_threaded(5, 5, [(1, 1, 1)], threads=threads)
+
+
+def test_single_thread_creates_no_pool(monkeypatch, instances):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool criado com threads=1")
+
+    monkeypatch.setattr(dynamic_programming_numpy, "ThreadPoolExecutor", no_pool)
+    for max_weight, max_volume, items in instances[:10]:
+        value, selected, _ = solve_threaded(max_weight, max_volume, items, threads=1)
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+def test_pareto_large_capacities():
+    # Capacidades grandes demais pra tabela W x V, poucos estados
+    items = [(10**6 * w, 10**6 * v, val) for w, v, val in
+             [(3, 4, 5), (4, 3, 6), (2, 5, 4), (5, 2, 5), (6, 6, 9)]]
+    value, selected, _ = solve_pareto(10**7, 10**7, items)
+    assert value == brute_force(10**7, 10**7, items)
+    check_selection(10**7, 10**7, items, value, selected)
+
+
+@pytest.mark.parametrize("epsilon", [0.1, 0.3, 0.5])
+@pytest.mark.parametrize("factor", [1, 40])
+def test_approximate_guarantee(epsilon, factor, instances):
+    # factor 40: capacidades grandes o bastante pra escala passar de 1
+    for max_weight, max_volume, items in instances:
+        items = [(factor * w, factor * v, val) for w, v, val in items]
+        max_weight, max_volume = factor * max_weight, factor * max_volume
+        optimum = brute_force(max_weight, max_volume, items)
+
+        value, selected, _, upper_bound = solve_approximate(
+            max_weight, max_volume, items, epsilon
+        )
+        check_selection(max_weight, max_volume, items, value, selected)
+        assert value >= (1 - epsilon) * optimum
+        assert upper_bound >= optimum
+
+
+@pytest.mark.parametrize("capacities", [(0, 10), (10, 0), (0, 0)])
+def test_approximate_zero_capacity(capacities):
+    value, selected, _, upper_bound = solve_approximate(*capacities, [(1, 1, 5)])
+    assert (value, selected, upper_bound) == (0, [], 0)
+
+
+@pytest.mark.parametrize("threads", [1, 2])
+def test_out_of_core_releases_memmaps(tmp_path, monkeypatch, threads):
+    # No Windows um arquivo ainda mapeado não pode ser apagado: nenhum
+    # memmap pode estar vivo quando a pasta temporária é removida
+    maps = []
+    alive_at_cleanup = []
+    memmap = np.memmap
+
+    def tracked(*args, **kwargs):
+        array = memmap(*args, **kwargs)
+        maps.append(weakref.ref(array))
+        return array
+
+    class CheckedDirectory(tempfile.TemporaryDirectory):
+        def __exit__(self, *exc):
+            gc.collect()
+            alive_at_cleanup.append(sum(ref() is not None for ref in maps))
+            return super().__exit__(*exc)
+
+    monkeypatch.setattr(dynamic_programming_numpy.np, "memmap", tracked)
+    monkeypatch.setattr(
+        dynamic_programming_numpy.tempfile, "TemporaryDirectory", CheckedDirectory
+    )
+    items = [(3, 4, 5), (4, 3, 6), (5, 5, 9)]
+    value, _, _ = solve_out_of_core(
+        20, 20, items, directory=str(tmp_path), tile_rows=4, threads=threads
+    )
+
+    assert value == brute_force(20, 20, items)
+    assert len(maps) == 3
+    assert alive_at_cleanup == [0]
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+import generate_instances
+from generate_instances import (
+    CAPACITIES, FAMILIES, capacities_for, generate_items, generate_suite,
+    instance_seed, item_chunks, write_instance,
+)
+from instance_loader import load_instance
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_family_reproducible_from_seed(family):
+    first = generate_items(family, 500, seed=7)
+    assert np.array_equal(first, generate_items(family, 500, seed=7))
+    assert not np.array_equal(first, generate_items(family, 500, seed=8))
+
+    # mesma semente e mesmo tamanho de bloco = mesmos blocos (write_instance
+    # percorre a instância duas vezes contando com isso)
+    chunks = list(item_chunks(family, 500, seed=7, chunk_size=128))
+    assert [len(chunk) for chunk in chunks] == [128, 128, 128, 116]
+    again = item_chunks(family, 500, seed=7, chunk_size=128)
+    assert all(np.array_equal(a, b) for a, b in zip(chunks, again))
+
+
+@pytest.mark.parametrize("capacity", list(CAPACITIES))
+@pytest.mark.parametrize("family", FAMILIES)
+def test_family_items_are_valid(family, capacity):
+    for n_items in (100, 1000):
+        items = generate_items(family, n_items, instance_seed(f"{family}_{n_items}"))
+        max_weight, max_volume = capacities_for(items, capacity)
+
+        assert items.shape == (n_items, 3)
+        assert items.dtype == np.int64
+        assert (items > 0).all()
+        # todo item cabe sozinho na mochila
+        assert (items[:, 0] <= max_weight).all()
+        assert (items[:, 1] <= max_volume).all()
+
+
+def test_unknown_family_is_rejected():
+    with pytest.raises(ValueError):
+        generate_items("nenhuma", 10, seed=1)
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_write_instance_matches_items(tmp_path, family):
+    path = str(tmp_path / f"{family}.txt")
+    seed = instance_seed(family)
+    max_weight, max_volume = write_instance(path, family, 300, seed)
+
+    loaded_weight, loaded_volume, items = load_instance(path, use_cache=False)
+    expected = generate_items(family, 300, seed)
+    assert (loaded_weight, loaded_volume) == (max_weight, max_volume)
+    assert (max_weight, max_volume) == capacities_for(expected)
+    assert np.array_equal(items, expected)
+    assert os.listdir(tmp_path) == [f"{family}.txt"]
+
+
+def test_suite_reproducible(tmp_path):
+    def suite(name):
+        out_dir = tmp_path / name
+        generate_suite(
+            str(out_dir), families=FAMILIES[:2], sizes=(20,), count=2,
+            capacities=("apertada", "folgada"), jobs=2
+        )
+        return {
+            filename: (out_dir / filename).read_bytes()
+            for filename in sorted(os.listdir(out_dir))
+        }
+
+    first = suite("a")
+    assert len(first) == 2 * 2 * 2
+    assert "sem_correlacao_apertada_20_1.txt" in first
+    assert suite("b") == first
+
+
+def test_create_test_instances_reproduces_committed_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_instances.create_test_instances()
+
+    committed = os.path.join(REPO, "instancias")
+    names = sorted(name for name in os.listdir(committed) if name.endswith(".txt"))
+    assert sorted(os.listdir(tmp_path / "instancias")) == names
+    assert len(names) == 80
+
+    for name in names:
+        with open(os.path.join(committed, name), "rb") as f:
+            assert (tmp_path / "instancias" / name).read_bytes() == f.read(), name
+
+    # e os itens respeitam o próprio gerador: cada um cabe na mochila
+    for name in names:
+        max_weight, max_volume, items = load_instance(
+            os.path.join(committed, name), use_cache=False
+        )
+        assert (items > 0).all()
+        assert (items[:, 0] <= max_weight).all()
+        assert (items[:, 1] <= max_volume).all()
@@ -0,0 +1,83 @@
+import pytest
+
+import branch_and_bound
+from backtracking import ratio_order, solve_backtracking_2d
+from conftest import brute_force, check_selection
+from dynamic_programming import solve_with_traceback_3d
+from heuristics import heuristic_solution
+
+
+def columns(items):
+    return tuple(map(list, zip(*items))) if items else ([], [], [])
+
+
+def test_heuristic_is_feasible_lower_bound(instances):
+    for max_weight, max_volume, items in instances:
+        value, selected = heuristic_solution(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+        assert value <= brute_force(max_weight, max_volume, items)
+
+
+@pytest.mark.parametrize("strategy", ["dfs", "best_first"])
+def test_branch_and_bound_warm_start(strategy, instances):
+    for max_weight, max_volume, items in instances:
+        weights, volumes, values = columns(items)
+        optimum = brute_force(max_weight, max_volume, items)
+
+        stats = {}
+        value, selected, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, weights, volumes, values, strategy, stats=stats
+        )
+        assert value == optimum
+        check_selection(max_weight, max_volume, items, value, selected)
+        # a primeira entrada da linha do tempo é o incumbente da heurística
+        if stats["incumbents"]:
+            heuristic_value, _ = heuristic_solution(max_weight, max_volume, items)
+            assert stats["incumbents"][0][1] == heuristic_value
+
+        assert branch_and_bound.solve_items(
+            max_weight, max_volume,
+            [branch_and_bound.Item(*item) for item in items], strategy
+        ) == optimum
+
+
+def test_optimal_incumbent_is_returned(instances):
+    # Nada supera uma seleção ótima: ela volta como resposta
+    for max_weight, max_volume, items in instances:
+        weights, volumes, values = columns(items)
+        value, optimal, _ = solve_with_traceback_3d(max_weight, max_volume, items)
+
+        bb_value, bb_selected, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, weights, volumes, values,
+            initial_selection=optimal, warm_start=False
+        )
+        assert (bb_value, bb_selected) == (value, optimal)
+
+        bt_value, positions = solve_backtracking_2d(
+            max_weight, max_volume, weights, volumes, values,
+            initial_selection=optimal, warm_start=False
+        )
+        order = ratio_order(weights, volumes, values)
+        assert bt_value == value
+        assert sorted(order[k] for k in positions) == optimal
+
+
+def test_backtracking_warm_start(instances):
+    for max_weight, max_volume, items in instances:
+        weights, volumes, values = columns(items)
+        value, positions = solve_backtracking_2d(
+            max_weight, max_volume, weights, volumes, values
+        )
+        order = ratio_order(weights, volumes, values)
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(
+            max_weight, max_volume, items, value, [order[k] for k in positions]
+        )
+
+
+def test_infeasible_initial_selection_is_rejected():
+    weights, volumes, values = [3, 4, 5], [3, 4, 5], [3, 4, 5]
+    with pytest.raises(ValueError):
+        branch_and_bound.solve(6, 6, weights, volumes, values, initial_selection=[1, 2])
+    with pytest.raises(ValueError):
+        solve_backtracking_2d(6, 6, weights, volumes, values, initial_selection=[1, 2])
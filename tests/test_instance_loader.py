@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+
+import branch_and_bound
+import instance_loader
+from conftest import brute_force
+from instance_loader import load_instance, load_item_set, load_items
+
+
+ITEMS = [(3, 4, 5), (4, 3, 6), (2, 5, 4)]
+
+
+def write(path, max_weight, max_volume, items):
+    lines = [f"{max_weight} {max_volume}"] + [" ".join(map(str, item)) for item in items]
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def instance(tmp_path):
+    path = tmp_path / "inst.txt"
+    write(path, 10, 9, ITEMS)
+    return path
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    # Conta quantas vezes o texto é convertido (miss do cache)
+    calls = []
+    parse = instance_loader.parse_instance
+
+    def counted(data):
+        calls.append(data)
+        return parse(data)
+
+    monkeypatch.setattr(instance_loader, "parse_instance", counted)
+    return calls
+
+
+def test_reads_instance(instance):
+    max_weight, max_volume, items = load_instance(instance, use_cache=False)
+    assert (max_weight, max_volume) == (10, 9)
+    assert items.dtype == np.int64
+    assert items.tolist() == [list(item) for item in ITEMS]
+    assert load_items(instance) == (10, 9, ITEMS)
+    _, _, item_set = load_item_set(instance)
+    assert list(item_set) == ITEMS
+
+
+def test_cache_hit_does_not_parse(instance, parses):
+    first = load_instance(instance)
+    second = load_instance(instance)
+
+    assert len(parses) == 1
+    assert first[:2] == second[:2] == (10, 9)
+    assert np.array_equal(first[2], second[2])
+    # segunda leitura: mapeada do .npy, somente leitura
+    assert not second[2].flags.writeable
+
+
+def test_touched_file_with_same_content_keeps_array(instance, parses):
+    load_instance(instance)
+    st = instance.stat()
+    os.utime(instance, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    # mtime mudou: relê o texto, mas o SHA-1 bate e o .npy é reaproveitado
+    assert load_instance(instance)[2].tolist() == [list(item) for item in ITEMS]
+    assert len(parses) == 1
+
+    load_instance(instance)
+    assert len(parses) == 1
+
+
+@pytest.mark.parametrize("change", ["mtime", "size"])
+def test_changed_file_invalidates_cache(instance, parses, change):
+    load_instance(instance)
+    st = instance.stat()
+
+    if change == "size":
+        items = ITEMS + [(1, 1, 7)]
+        write(instance, 10, 9, items)
+    else:
+        # mesmo tamanho, outro conteúdo e outro mtime
+        items = [(3, 4, 5), (4, 3, 6), (2, 5, 8)]
+        write(instance, 10, 9, items)
+        assert instance.stat().st_size == st.st_size
+        os.utime(instance, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    assert load_items(instance) == (10, 9, items)
+    assert len(parses) == 2
+
+
+@pytest.mark.parametrize("text", ["", "10\n", "10 9\n1 2\n", "10 9\n1 2 3 4\n", "10 x\n"])
+def test_malformed_file_is_rejected(tmp_path, text):
+    path = tmp_path / "bad.txt"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        load_instance(path)
+    # nada foi guardado pra próxima leitura
+    assert not (tmp_path / instance_loader.CACHE_DIR / "bad.txt.npy").exists()
+
+
+def test_solve_instance_reads_through_loader(instance, parses):
+    assert branch_and_bound.solve_instance(str(instance)) == brute_force(10, 9, ITEMS)
+    assert branch_and_bound.solve_instance(str(instance), "best_first") == brute_force(
+        10, 9, ITEMS
+    )
+    assert len(parses) == 1
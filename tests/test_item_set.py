@@ -0,0 +1,97 @@
+import pickle
+import random
+from array import array
+
+import numpy as np
+import pytest
+
+import branch_and_bound
+from backtracking import Item, ratio_order, solve_backtracking_2d
+from conftest import brute_force
+from item_set import ItemSet, as_item_set
+
+
+ITEMS = [(3, 4, 5), (4, 3, 6), (2, 5, 4), (5, 2, 5)]
+
+
+def test_behaves_like_tuple_list():
+    items = ItemSet.from_tuples(ITEMS)
+    assert len(items) == 4
+    assert items[1] == (4, 3, 6)
+    assert list(items) == ITEMS
+    assert items.tolist() == ITEMS
+    assert list(items[1:3]) == ITEMS[1:3]
+    assert list(items.take([3, 0])) == [ITEMS[3], ITEMS[0]]
+    assert as_item_set(items) is items
+    assert list(as_item_set(ITEMS)) == ITEMS
+
+
+def test_columns_must_match():
+    with pytest.raises(ValueError):
+        ItemSet([1, 2], [1, 2], [1])
+
+
+def test_from_array_does_not_copy():
+    table = np.array(ITEMS, dtype=np.int64)
+    items = ItemSet.from_array(table)
+    table[0, 2] = 50
+    assert items[0] == (3, 4, 50)
+    assert np.shares_memory(items.columns()[2], table)
+    assert np.array_equal(np.asarray(items), table)
+
+
+def test_pickle_round_trip():
+    items = ItemSet.from_array(np.array(ITEMS, dtype=np.int64))
+    assert list(pickle.loads(pickle.dumps(items))) == ITEMS
+
+
+def test_ratio_order_matches_backtracking():
+    weights, volumes, values = map(list, zip(*ITEMS))
+    items = ItemSet(array("q", weights), array("q", volumes), array("q", values))
+    assert items.ratio_order == ratio_order(weights, volumes, values)
+    assert list(items.ratios) == [val / (w + v) for w, v, val in ITEMS]
+
+
+def test_backtracking_item_kept():
+    item = Item(3, 4, 5, 5 / 7)
+    assert (item.weight, item.volume, item.value) == (3, 4, 5)
+
+
+def test_solvers_accept_item_set(instances):
+    for max_weight, max_volume, items in instances:
+        item_set = ItemSet.from_array(np.array(items, dtype=np.int64).reshape(-1, 3))
+        optimum = brute_force(max_weight, max_volume, items)
+
+        for bound_mode in ("classic", "surrogate"):
+            value, _, _, _ = branch_and_bound.solve(
+                max_weight, max_volume, item_set, bound_mode=bound_mode
+            )
+            assert value == optimum
+        assert branch_and_bound.solve_items(max_weight, max_volume, item_set) == optimum
+
+        value, _ = solve_backtracking_2d(max_weight, max_volume, item_set)
+        assert value == optimum
+
+
+def test_classic_bound_matches_reference(instances):
+    # make_classic_bound (prefixos + bisect) dá o mesmo valor do laço de bound()
+    rng = random.Random(25)
+    for max_weight, max_volume, items in instances:
+        item_set = ItemSet.from_tuples(items)
+        ordered = item_set.take(item_set.ratio_order)
+        bb_items = [branch_and_bound.Item(*item) for item in ordered]
+        bound_fn = branch_and_bound.make_classic_bound(ordered, max_weight, max_volume)
+
+        for _ in range(20):
+            idx = rng.randint(0, len(ordered))
+            cur_w = rng.randint(0, max_weight)
+            cur_v = rng.randint(0, max_volume)
+            cur_val = rng.randint(0, 100)
+            expected = branch_and_bound.bound(
+                ordered, idx, max_weight, max_volume, cur_w, cur_v, cur_val
+            )
+            assert bound_fn(idx, cur_w, cur_v, cur_val) == expected
+            # assinatura antiga: lista de Item
+            assert branch_and_bound.bound(
+                bb_items, idx, max_weight, max_volume, cur_w, cur_v, cur_val
+            ) == expected
@@ -0,0 +1,136 @@
+import random
+import time
+from math import gcd
+
+import pytest
+
+import portfolio
+from conftest import brute_force, check_selection, random_instance
+from dynamic_programming import solve_with_traceback_3d
+from generate_instances import capacities_for, generate_items
+from preprocessing import (
+    dominated, lp_bound, make_lp_bound, reduce_instance, restore_solution,
+)
+
+
+def scaled_instances(seed, count=60):
+    # Pesos múltiplos de 3 e volumes múltiplos de 2: o MDC tem o que dividir
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        max_weight, max_volume, items = random_instance(rng)
+        items = [(3 * w, 2 * v, val) for w, v, val in items]
+        result.append((3 * max_weight + rng.randint(0, 2), 2 * max_volume + rng.randint(0, 1), items))
+    return result
+
+
+def test_reduction_keeps_the_optimum(instances):
+    for max_weight, max_volume, items in instances + scaled_instances(14):
+        reduced = reduce_instance(max_weight, max_volume, items)
+
+        # ótimo da reduzida + fixados = ótimo original
+        best = brute_force(reduced.max_weight, reduced.max_volume, reduced.items)
+        assert best + reduced.fixed_value == brute_force(max_weight, max_volume, items)
+
+        # e a solução da reduzida volta viável pros índices originais
+        value, selected, _ = solve_with_traceback_3d(
+            reduced.max_weight, reduced.max_volume, reduced.items
+        )
+        value, selected = restore_solution(reduced, value, selected)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+def test_gcd_scaling():
+    for max_weight, max_volume, items in scaled_instances(15):
+        reduced = reduce_instance(max_weight, max_volume, items)
+        if not reduced.items:
+            continue
+
+        weight_gcd = volume_gcd = 0
+        for w, v, _ in reduced.items:
+            weight_gcd = gcd(weight_gcd, w)
+            volume_gcd = gcd(volume_gcd, v)
+        assert weight_gcd == 1 and volume_gcd == 1
+
+
+def test_dominated_item_removed_only_if_both_do_not_fit():
+    # o item 1 é pior que o 0 em tudo
+    items = [(3, 3, 10), (4, 4, 8), (1, 1, 1)]
+    assert dominated(items, [0, 1, 2], 6, 6) == [0, 2]
+    # cabem juntos: os dois podem estar na solução ótima
+    assert dominated(items, [0, 1, 2], 7, 7) == [0, 1, 2]
+
+
+def test_identical_items_keep_the_first():
+    items = [(5, 5, 5), (5, 5, 5)]
+    assert dominated(items, [0, 1], 9, 9) == [0]
+
+
+def test_bound_fixing_forces_item_in():
+    # sem o item 0 nem o bound chega perto do valor dele
+    items = [(5, 5, 100), (4, 4, 1), (3, 3, 1)]
+    reduced = reduce_instance(10, 10, items)
+    assert 0 in reduced.fixed_items
+    assert reduced.fixed_value >= 100
+
+    best = brute_force(reduced.max_weight, reduced.max_volume, reduced.items)
+    assert best + reduced.fixed_value == brute_force(10, 10, items)
+
+
+def test_prefix_bound_matches_lp_bound(instances):
+    rng = random.Random(14)
+    for max_weight, max_volume, items in instances:
+        if not items:
+            continue
+        mu = rng.random()
+        a, b = (1 - mu) / max_weight, mu / max_volume
+        order = sorted(
+            range(len(items)),
+            key=lambda i: items[i][2] / (a * items[i][0] + b * items[i][1]),
+            reverse=True
+        )
+        bound = make_lp_bound(order, items, max_weight, max_volume, mu)
+
+        for skip in range(len(items)):
+            cap_weight = rng.randint(0, max_weight)
+            cap_volume = rng.randint(0, max_volume)
+            expected = lp_bound(
+                order, items, cap_weight, cap_volume, max_weight, max_volume, mu, skip
+            )
+            assert bound(cap_weight, cap_volume, skip) == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("family", ["sem_correlacao", "inversa_forte", "forte"])
+def test_reduction_time_on_hundreds_of_items(family):
+    # Antes: dominância O(n²) e uma volta inteira por item fixado dentro
+    # (segundos em 500 itens sem correlação)
+    table = generate_items(family, 500, seed=1)
+    max_weight, max_volume = capacities_for(table)
+    items = [tuple(int(x) for x in row) for row in table]
+
+    start = time.perf_counter()
+    reduced = reduce_instance(max_weight, max_volume, items)
+    assert time.perf_counter() - start < 1.0
+
+    # os fixados dentro cabem juntos
+    value, selected = restore_solution(reduced, 0, [])
+    check_selection(max_weight, max_volume, items, value, selected)
+
+
+@pytest.mark.parametrize("preprocess", [True, False])
+def test_portfolio_matches_brute_force(preprocess, instances):
+    for max_weight, max_volume, items in instances + scaled_instances(16, 20):
+        value, selected, _, _ = portfolio.solve(
+            max_weight, max_volume, items, preprocess=preprocess
+        )
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+@pytest.mark.parametrize("preprocess", [True, False])
+@pytest.mark.parametrize("capacities", [(0, 10**6), (10**6, 0), (0, 0)])
+def test_portfolio_zero_capacity(capacities, preprocess):
+    value, selected, _, _ = portfolio.solve(
+        *capacities, [(1, 1, 5), (2, 2, 3), (3, 1, 4)], preprocess=preprocess
+    )
+    assert (value, selected) == (0, [])
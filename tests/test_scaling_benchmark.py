@@ -0,0 +1,66 @@
+import csv
+
+import pytest
+
+import scaling_benchmark
+from generate_instances import FAMILIES, generate_items
+
+
+@pytest.mark.parametrize("family, offset", [("forte", 10), ("soma_subconjuntos", 0)])
+@pytest.mark.parametrize("value_range, n_items", [(20, 40), (60, 30), (200, 10)])
+def test_grid_instance_keeps_family(family, offset, value_range, n_items):
+    # Capacidades em que a família cabe com R pequeno: a grade tem que
+    # devolver itens da família (valor = (peso + volume) // 2 + R // 10),
+    # não os de R = 1000 arredondados (pesos fundidos, relação perdida)
+    for seed in range(3):
+        base = generate_items(family, n_items, seed, value_range)
+        max_weight = round(scaling_benchmark.TIGHTNESS * int(base[:, 0].sum()))
+        max_volume = round(scaling_benchmark.TIGHTNESS * int(base[:, 1].sum()))
+
+        items = scaling_benchmark.grid_instance(
+            family, n_items, max_weight, max_volume, seed
+        )
+        offsets = {val - (w + v) // 2 for w, v, val in items}
+        assert offsets == {value_range * offset // 100}
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+@pytest.mark.parametrize("capacities", [(50, 50), (800, 200), (200, 3200)])
+def test_grid_instance_capacities(family, capacities):
+    max_weight, max_volume = capacities
+    items = scaling_benchmark.grid_instance(family, 20, max_weight, max_volume, seed=3)
+
+    assert all(w >= 1 and v >= 1 for w, v, _ in items)
+    for column, capacity in ((0, max_weight), (1, max_volume)):
+        total = sum(item[column] for item in items)
+        assert capacity == pytest.approx(
+            scaling_benchmark.TIGHTNESS * total,
+            rel=scaling_benchmark.TIGHTNESS_TOLERANCE + scaling_benchmark.MAX_ROUNDING_ERROR
+        )
+
+
+def test_grid_instance_skips_degenerate_points():
+    # 200 itens pra W = V = 10: cada peso teria 1/6 de unidade
+    assert scaling_benchmark.grid_instance("forte", 200, 10, 10, seed=3) is None
+
+
+def test_tiny_grid_smoke(tmp_path):
+    rows = scaling_benchmark.run_grid(
+        FAMILIES[:2], [6, 10], [20, 40], [30], ["dp", "dp_numpy", "bb", "bt"],
+        instances=2, time_limit=5.0
+    )
+    # duas famílias x dois n x dois W x um V, quatro solvers
+    assert len(rows) == 2 * 2 * 2 * 4
+    assert all(row["otimo"] and row["tempo"] is not None for row in rows)
+
+    fits = scaling_benchmark.fit_growth(rows)
+    points = scaling_benchmark.crossovers(rows)
+    grid_csv, crossovers_csv = tmp_path / "grid.csv", tmp_path / "crossovers.csv"
+    scaling_benchmark.save_grid_csv(rows, grid_csv)
+    scaling_benchmark.save_crossovers_csv(points, crossovers_csv)
+    scaling_benchmark.print_report(fits, points)
+
+    with open(grid_csv, encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == len(rows)
+    with open(crossovers_csv, encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == len(points)
@@ -0,0 +1,163 @@
+import random
+import sys
+
+import pytest
+
+import branch_and_bound
+from backtracking import ratio_order, solve_backtracking_2d
+from conftest import brute_force, check_selection
+from dynamic_programming_numpy import solve_vectorized
+from item_set import ItemSet
+
+
+@pytest.mark.parametrize("bound_mode", ["classic", "surrogate"])
+@pytest.mark.parametrize("strategy", ["dfs", "best_first"])
+def test_branch_and_bound_matches_brute_force(strategy, bound_mode, instances):
+    for max_weight, max_volume, items in instances:
+        weights, volumes, values = map(list, zip(*items)) if items else ([], [], [])
+        stats = {}
+        value, selected, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, weights, volumes, values, strategy,
+            bound_mode=bound_mode, warm_start=False, stats=stats
+        )
+        assert value == brute_force(max_weight, max_volume, items)
+        assert stats["optimal"]
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+@pytest.mark.parametrize("bound_mode", ["classic", "surrogate"])
+def test_parallel_matches_brute_force(bound_mode, instances):
+    # Um pool por instância: poucas instâncias bastam
+    for max_weight, max_volume, items in instances[:8]:
+        weights, volumes, values = map(list, zip(*items)) if items else ([], [], [])
+        value, selected, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, weights, volumes, values, "parallel",
+            bound_mode=bound_mode, workers=2, split_depth=3, warm_start=False
+        )
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+@pytest.mark.parametrize("capacities", [(0, 10), (10, 0), (0, 0)])
+@pytest.mark.parametrize("bound_mode", ["classic", "surrogate"])
+@pytest.mark.parametrize("strategy", ["dfs", "best_first"])
+def test_branch_and_bound_zero_capacity(strategy, bound_mode, capacities):
+    stats = {}
+    value, selected, _, _ = branch_and_bound.solve(
+        *capacities, [1, 2], [1, 2], [3, 4], strategy,
+        bound_mode=bound_mode, stats=stats
+    )
+    assert (value, selected) == (0, [])
+    assert stats["optimal"] and stats["gap"] == 0
+
+
+@pytest.mark.parametrize("density_bound", [True, False])
+def test_backtracking_matches_brute_force(density_bound, instances):
+    for max_weight, max_volume, items in instances:
+        weights, volumes, values = map(list, zip(*items)) if items else ([], [], [])
+        value, positions = solve_backtracking_2d(
+            max_weight, max_volume, weights, volumes, values,
+            density_bound=density_bound, warm_start=False
+        )
+        # posições na ordem por densidade
+        order = ratio_order(weights, volumes, values)
+        selected = [order[k] for k in positions]
+
+        assert value == brute_force(max_weight, max_volume, items)
+        check_selection(max_weight, max_volume, items, value, selected)
+
+
+def test_search_deeper_than_recursion_limit():
+    # Pilha explícita: um nível por item, sem RecursionError
+    n = sys.getrecursionlimit() + 500
+    ones = [1] * n
+
+    value, _ = solve_backtracking_2d(n, n, ones, ones, ones, warm_start=False)
+    assert value == n
+
+    value, selected, _, _ = branch_and_bound.solve(n, n, ones, ones, ones, warm_start=False)
+    assert value == n
+    assert selected == list(range(n))
+
+
+def anytime_instances(count=10, n=30):
+    # Grandes demais pra poucos nós bastarem, pequenas pra DP dar o ótimo
+    rng = random.Random(10)
+    result = []
+    for _ in range(count):
+        items = [
+            (rng.randint(10, 60), rng.randint(10, 60), rng.randint(10, 60))
+            for _ in range(n)
+        ]
+        max_weight = sum(w for w, _, _ in items) // 3
+        max_volume = sum(v for _, v, _ in items) // 3
+        result.append((max_weight, max_volume, items))
+    return result
+
+
+@pytest.mark.parametrize("bound_mode", ["classic", "surrogate"])
+@pytest.mark.parametrize("strategy", ["dfs", "best_first"])
+def test_branch_and_bound_anytime(strategy, bound_mode):
+    for max_weight, max_volume, items in anytime_instances():
+        weights, volumes, values = map(list, zip(*items))
+        optimum, _, _ = solve_vectorized(max_weight, max_volume, items)
+        _, _, bound_fn = branch_and_bound.setup_bound(
+            ItemSet(weights, volumes, values), max_weight, max_volume, bound_mode
+        )
+        root_bound = bound_fn(0, 0, 0, 0)
+
+        # cortado por max_nodes: incumbente viável, sem ótimo provado
+        stats = {}
+        value, selected, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, weights, volumes, values, strategy,
+            bound_mode=bound_mode, max_nodes=5, warm_start=False, stats=stats
+        )
+        check_selection(max_weight, max_volume, items, value, selected)
+        assert not stats["optimal"]
+        assert optimum <= stats["upper_bound"] <= max(value, root_bound)
+        assert stats["gap"] > 0
+
+        # cortado por time_limit: idem, mas pode até terminar
+        stats = {}
+        value, selected, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, weights, volumes, values, strategy,
+            bound_mode=bound_mode, time_limit=0, stats=stats
+        )
+        check_selection(max_weight, max_volume, items, value, selected)
+        assert optimum <= stats["upper_bound"] <= max(value, root_bound)
+        assert stats["optimal"] == (value == optimum and stats["gap"] == 0)
+
+        # sem limite: ótimo provado, gap zero
+        stats = {}
+        value, _, _, _ = branch_and_bound.solve(
+            max_weight, max_volume, weights, volumes, values, strategy,
+            bound_mode=bound_mode, stats=stats
+        )
+        assert value == optimum
+        assert stats["optimal"] and stats["gap"] == 0
+        assert stats["upper_bound"] == optimum
+
+
+def test_backtracking_anytime():
+    for max_weight, max_volume, items in anytime_instances():
+        weights, volumes, values = map(list, zip(*items))
+        optimum, _, _ = solve_vectorized(max_weight, max_volume, items)
+        order = ratio_order(weights, volumes, values)
+
+        stats = {}
+        value, positions = solve_backtracking_2d(
+            max_weight, max_volume, weights, volumes, values,
+            max_nodes=5, warm_start=False, stats=stats
+        )
+        check_selection(
+            max_weight, max_volume, items, value, [order[k] for k in positions]
+        )
+        assert not stats["optimal"] and stats["gap"] > 0
+        assert stats["upper_bound"] >= optimum
+
+        stats = {}
+        value, _ = solve_backtracking_2d(
+            max_weight, max_volume, weights, volumes, values, stats=stats
+        )
+        assert value == optimum
+        assert stats["optimal"] and stats["gap"] == 0
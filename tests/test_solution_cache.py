@@ -0,0 +1,115 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import solution_cache
+from solution_cache import SolutionCache, cached_solve, fingerprint
+
+
+ITEMS = [(3, 4, 5), (4, 3, 6), (2, 5, 4)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Relógio que sempre anda: last_access sem empates
+    ticks = itertools.count(1)
+    monkeypatch.setattr(solution_cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_miss_then_hit(cache):
+    assert cache.get(10, 10, ITEMS, "dp") is None
+
+    cache.put(10, 10, ITEMS, "dp", 11, [0, 1])
+    assert cache.get(10, 10, ITEMS, "dp") == (11, [0, 1], "dp")
+
+    # mesma instância com os itens em outra ordem: índices dessa ordem
+    assert cache.get(10, 10, ITEMS[::-1], "dp") == (11, [1, 2], "dp")
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = SolutionCache(path)
+    first.put(10, 10, ITEMS, "dp", 11, [0, 1], proved_by="bb")
+    first.close()
+
+    second = SolutionCache(path)
+    try:
+        assert second.memory == {}
+        assert second.get(10, 10, ITEMS, "dp") == (11, [0, 1], "bb")
+    finally:
+        second.close()
+
+
+def test_memory_hits_keep_entries_from_eviction(tmp_path, clock):
+    def instance(k):
+        return 10, 10, [(1, 1, k)]
+
+    # cabem exatamente três entradas do mesmo tamanho
+    size = len(fingerprint(*instance(0), "dp")[0]) + len("[0]") + len("dp") + 16
+    cache = SolutionCache(str(tmp_path / "cache.sqlite"), max_bytes=3 * size)
+    try:
+        for k in range(3):
+            cache.put(*instance(k), "dp", k, [0])
+
+        # a entrada 0 é lida sempre (da LRU em memória) enquanto entram outras
+        for k in range(3, 8):
+            assert cache.get(*instance(0), "dp") is not None
+            cache.put(*instance(k), "dp", k, [0])
+
+        assert cache.get(*instance(0), "dp") == (0, [0], "dp")
+        # as outras saem da mais antiga pra mais nova
+        for k in range(1, 6):
+            assert cache.get(*instance(k), "dp") is None
+        for k in (6, 7):
+            assert cache.get(*instance(k), "dp") is not None
+    finally:
+        cache.close()
+
+
+def test_key_separates_instances_and_solvers():
+    key = fingerprint(10, 10, ITEMS, "dp")[0]
+
+    # permutação e inteiros do NumPy: mesma chave
+    assert fingerprint(10, 10, ITEMS[::-1], "dp")[0] == key
+    assert fingerprint(np.int64(10), 10, np.array(ITEMS), "dp")[0] == key
+
+    others = [
+        fingerprint(11, 10, ITEMS, "dp"),
+        fingerprint(10, 11, ITEMS, "dp"),
+        fingerprint(10, 10, ITEMS, "bb"),
+        fingerprint(10, 10, ITEMS, "dp", {"epsilon": 0.1}),
+        # peso e volume trocados
+        fingerprint(10, 10, [(v, w, val) for w, v, val in ITEMS], "dp"),
+        fingerprint(10, 10, ITEMS[:2], "dp"),
+        fingerprint(10, 10, ITEMS + [ITEMS[0]], "dp"),
+    ]
+    keys = {key} | {other[0] for other in others}
+    assert len(keys) == len(others) + 1
+
+
+def test_cached_solve_stores_only_proven_optima(cache):
+    calls = []
+
+    def exact(W, V, items, stats):
+        calls.append("exact")
+        return 11, [1, 0]
+
+    def interrupted(W, V, items, stats):
+        calls.append("interrupted")
+        stats["optimal"] = False
+        return 9, [1]
+
+    assert cached_solve(cache, "bb", interrupted, 10, 10, ITEMS) == (9, [1], None)
+    assert cache.get(10, 10, ITEMS, "bb") is None
+
+    assert cached_solve(cache, "dp", exact, 10, 10, ITEMS) == (11, [0, 1], "dp")
+    assert cached_solve(cache, "dp", exact, 10, 10, ITEMS) == (11, [0, 1], "dp")
+    assert calls == ["interrupted", "exact"]